@@ -1,2 +1,5 @@
 from apiautomationtools.client.async_requests import AsyncRequests
+from apiautomationtools.client.cache import ResponseCache
+from apiautomationtools.client.history import BatchHistory
 from apiautomationtools.client.httpx_requests import HttpxRequests
+from apiautomationtools.client.sharded_requests import ShardedRequests
@@ -0,0 +1,140 @@
+import asyncio
+from collections import deque
+from typing import Any
+
+from apiautomationtools.client.record import TIMED_OUT
+
+# The status codes of responses that ask the client to slow down, and of cut off requests
+THROTTLE_CODES = ["429", "503", "504", TIMED_OUT]
+
+
+class AdaptiveLimit(object):
+    """
+    An AIMD limit on the requests in flight. It grows while latency stays flat, and is cut back
+    on throttling responses, errors or latency inflation.
+    """
+
+    def __init__(
+        self,
+        max_limit: int = 1000,
+        initial: None | int = None,
+        min_limit: int = 1,
+        backoff: float = 0.5,
+        tolerance: float = 2.0,
+        max_history: int = 1000,
+    ):
+        """
+        This is the constructor for AdaptiveLimit.
+
+        Args:
+            max_limit: The most requests to allow in flight.
+            initial: The starting limit (defaults to 10 or max_limit if it's lower).
+            min_limit: The fewest requests to allow in flight.
+            backoff: The factor the limit is cut by on congestion.
+            tolerance: How many times the lowest latency the smoothed latency may reach before
+                       it counts as congestion.
+            max_history: The most points of the limit over time to keep.
+        """
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(max(self.min_limit, min(initial or 10, self.max_limit)))
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.max_history = max_history
+        self.in_flight = 0
+        self.min_latency = None
+        self.latency = None
+        self.slow_start = True
+        self.history = []
+        self._waiters = deque()
+        self._loop = None
+        self._start = None
+        self._last_decrease = None
+
+    @staticmethod
+    def throttled(result: Any) -> bool:
+        """
+        This checks whether a result is a throttling response.
+
+        Args:
+            result: The worker result eg a response record.
+
+        Returns:
+            throttled: Whether the server asked the client to slow down.
+        """
+        return (
+            str(getattr(result, "get", lambda _: None)("actual_code")) in THROTTLE_CODES
+        )
+
+    def _note(self):
+        """
+        This adds the limit to its history when it changes, halving the history when it's full.
+        """
+        limit = int(self.limit)
+        if self.history and self.history[-1][1] == limit:
+            return
+        self.history.append((round(self._loop.time() - self._start, 6), limit))
+        if len(self.history) > self.max_history:
+            self.history[1:] = self.history[2::2]
+
+    def _wake(self):
+        """
+        This lets waiting requests go while there's room under the limit.
+        """
+        room = int(self.limit) - self.in_flight
+        while room > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                room -= 1
+
+    async def acquire(self):
+        """
+        This waits for room under the limit and takes it.
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._start = self._loop.time()
+            self._note()
+
+        while self.in_flight >= int(self.limit):
+            waiter = self._loop.create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self.in_flight += 1
+
+    def release(self, latency: float, congested: bool = False):
+        """
+        This gives back a request's room and adjusts the limit from how it went. The limit is
+        cut at most once per round trip, as the requests in flight saw the same congestion.
+
+        Args:
+            latency: The request's latency in seconds.
+            congested: Whether the request was throttled, failed or timed out.
+        """
+        self.in_flight -= 1
+        now = self._loop.time()
+        # Throttling responses are often quicker than real ones, so they'd skew the baseline
+        if not congested:
+            self.min_latency = min(latency, self.min_latency or latency)
+            self.latency = (
+                latency if self.latency is None else 0.9 * self.latency + 0.1 * latency
+            )
+            congested = self.latency > self.tolerance * self.min_latency
+
+        if congested:
+            if self._last_decrease is None or now - self._last_decrease > (
+                self.latency or latency
+            ):
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+                self.slow_start = False
+                # The backed up latency is the old limit's, so it starts afresh
+                self.latency = self.min_latency
+        elif self.slow_start:
+            self.limit = min(self.max_limit, self.limit + 1)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self._note()
+        self._wake()
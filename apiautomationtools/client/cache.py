@@ -0,0 +1,330 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable
+
+import orjson
+from multidict import CIMultiDict
+
+from apiautomationtools.client.clock import MonotonicClock
+from apiautomationtools.client.coalescing import RequestCoalescer
+from apiautomationtools.client.record import body_json
+
+# The sqlite columns of a cached response, after its key
+COLUMNS = (
+    "method",
+    "status",
+    "headers",
+    "content",
+    "encoding",
+    "expires",
+    "etag",
+    "last_modified",
+)
+
+
+class ResponseCache(object):
+    """
+    An LRU cache of GET responses with a byte budget and an optional sqlite file behind it.
+    Stale responses are revalidated with If-None-Match and If-Modified-Since requests.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20, path: None | str = None):
+        """
+        This is the constructor for ResponseCache. One cache can be shared by several clients.
+
+        Args:
+            max_bytes: The most response body bytes to keep in memory.
+            path: The path of a sqlite file that keeps every response across runs.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.db_lock = threading.Lock()
+        self.db = None
+        if path:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS cached_responses "
+                f"(key BLOB PRIMARY KEY, {', '.join(COLUMNS)})"
+            )
+
+    @staticmethod
+    def key(method: str, url: str, kwargs: dict) -> None | bytes:
+        """
+        This gets the cache key of a request. Only GET requests are cached.
+
+        Args:
+            method: The request method eg get.
+            url: The request url.
+            kwargs: The additional params eg headers or params etc.
+
+        Returns:
+            key: The cache key, or None if the request isn't cacheable.
+        """
+        if method.upper() != "GET":
+            return None
+        return RequestCoalescer.key(method, url, kwargs)
+
+    def _cached(self, key: bytes) -> None | dict:
+        """
+        This gets a response kept in memory.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            entry: The cached response eg {'status': ..., 'headers': ..., 'content': ..., ...}.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            not entry or self.entries.move_to_end(key)
+            return entry
+
+    def _read(self, key: bytes) -> None | dict:
+        """
+        This reads a response from the sqlite file and keeps it in memory.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            entry: The cached response eg {'status': ..., 'headers': ..., 'content': ..., ...}.
+        """
+        with self.db_lock:
+            row = self.db.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM cached_responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if not row:
+            return None
+
+        entry = dict(zip(COLUMNS, row))
+        entry["headers"] = CIMultiDict(orjson.loads(entry["headers"]))
+        with self.lock:
+            self._remember(key, entry)
+        return entry
+
+    def get(self, key: bytes) -> None | dict:
+        """
+        This gets a cached response, reading it from the sqlite file if it isn't in memory. The
+        read is made on the calling thread, so responses are loaded with load() on the event
+        loop.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            entry: The cached response eg {'status': ..., 'headers': ..., 'content': ..., ...}.
+        """
+        entry = self._cached(key)
+        if entry or not self.db:
+            return entry
+        return self._read(key)
+
+    async def load(self, key: bytes) -> None | dict:
+        """
+        This gets a cached response, reading it from the sqlite file on a worker thread if it
+        isn't in memory, so the event loop isn't held up by the disk.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            entry: The cached response eg {'status': ..., 'headers': ..., 'content': ..., ...}.
+        """
+        entry = self._cached(key)
+        if entry or not self.db:
+            return entry
+        return await asyncio.to_thread(self._read, key)
+
+    def _remember(self, key: bytes, entry: dict):
+        """
+        This keeps an entry in memory, evicting the least recently used ones over budget.
+
+        Args:
+            key: The cache key.
+            entry: The cached response.
+        """
+        old = self.entries.pop(key, None)
+        self.size -= len(old["content"]) if old else 0
+        if len(entry["content"]) > self.max_bytes:
+            return
+
+        self.entries[key] = entry
+        self.size += len(entry["content"])
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted["content"])
+
+    def put(self, key: bytes, entry: dict):
+        """
+        This stores a response. The sqlite write is made on the calling thread, so responses
+        are stored with store() on the event loop.
+
+        Args:
+            key: The cache key.
+            entry: The response to cache eg {'status': ..., 'headers': ..., 'content': ..., ...}.
+        """
+        with self.lock:
+            self._remember(key, entry)
+        not self.db or self._write(key, entry)
+
+    async def store(self, key: bytes, entry: dict):
+        """
+        This stores a response, writing it to the sqlite file on a worker thread so the event
+        loop isn't held up by the disk.
+
+        Args:
+            key: The cache key.
+            entry: The response to cache eg {'status': ..., 'headers': ..., 'content': ..., ...}.
+        """
+        with self.lock:
+            self._remember(key, entry)
+        not self.db or await asyncio.to_thread(self._write, key, entry)
+
+    def _write(self, key: bytes, entry: dict):
+        """
+        This writes a response to the sqlite file.
+
+        Args:
+            key: The cache key.
+            entry: The response to cache.
+        """
+        row = {**entry, "headers": orjson.dumps(list(entry["headers"].items()))}
+        with self.db_lock:
+            self.db.execute(
+                f"REPLACE INTO cached_responses VALUES (?{', ?' * len(COLUMNS)})",
+                (key, *(row[column] for column in COLUMNS)),
+            )
+            self.db.commit()
+
+    @staticmethod
+    def freshness(headers: dict) -> None | dict:
+        """
+        This gets how long a response stays fresh and how to revalidate it.
+
+        Args:
+            headers: The response headers.
+
+        Returns:
+            freshness: The expiry time and validators, or None if the response can't be stored
+                eg {'expires': ..., 'etag': ..., 'last_modified': ...}.
+        """
+        headers = {k.lower(): v for k, v in headers.items()}
+        directives = {}
+        for directive in headers.get("cache-control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            directives[name.lower()] = value.strip('"')
+
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if "no-store" in directives:
+            return None
+
+        lifetime = 0
+        try:
+            if "no-cache" in directives:
+                lifetime = 0
+            elif "max-age" in directives:
+                lifetime = int(directives["max-age"])
+            elif "expires" in headers:
+                lifetime = parsedate_to_datetime(headers["expires"]).timestamp()
+                lifetime -= time.time()
+        except (TypeError, ValueError):
+            lifetime = 0
+
+        if lifetime <= 0 and not etag and not last_modified:
+            return None
+        return {
+            "expires": time.time() + lifetime,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+
+    def _response(self, entry: dict, response: dict, status: str, body: str) -> dict:
+        """
+        This builds the response info of a cached response.
+
+        Args:
+            entry: The cached response.
+            response: The response info of the request that was sent, if any.
+            status: The cache status eg hit or revalidated.
+            body: The client's body mode eg json.
+
+        Returns:
+            response: The response info eg {'status': ..., 'json': ..., 'cache_status': ...}.
+        """
+        return {
+            **response,
+            "status": entry["status"],
+            "headers": entry["headers"],
+            "json": body_json(entry["content"], entry["encoding"], body),
+            "content": entry["content"],
+            "encoding": entry["encoding"],
+            "cache_status": status,
+        }
+
+    async def send(
+        self,
+        key: bytes,
+        send: Callable[..., Awaitable[dict]],
+        headers: None | dict = None,
+        body: str = "json",
+    ) -> dict:
+        """
+        This answers a request from the cache, revalidates a stale response or sends it.
+
+        Args:
+            key: The cache key from key().
+            send: Sends the request with the given headers and returns its response info.
+            headers: The request headers.
+            body: The client's body mode eg json.
+
+        Returns:
+            response: The response info with its cache status, which is hit, revalidated or
+                      miss eg {'status': ..., 'cache_status': 'hit'}.
+        """
+        entry = await self.load(key)
+        if entry and entry["expires"] > time.time():
+            response = {"method": entry["method"], "t1": MonotonicClock.now()}
+            return self._response(entry, {**response, "timings": None}, "hit", body)
+
+        validators = {}
+        if entry and entry["etag"]:
+            validators["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            validators["If-Modified-Since"] = entry["last_modified"]
+        response = await send(headers={**(headers or {}), **validators})
+
+        if response["status"] == "304" and entry:
+            freshness = self.freshness(response["headers"]) or {}
+            entry = {**entry, **{k: v for k, v in freshness.items() if v is not None}}
+            await self.store(key, entry)
+            return self._response(entry, response, "revalidated", body)
+
+        freshness = self.freshness(response["headers"])
+        if (
+            response["status"] == "200"
+            and response["content"] is not None
+            and freshness
+        ):
+            keys = ["method", "status", "content", "encoding"]
+            entry = {k: response[k] for k in keys}
+            entry["headers"] = response["headers"]
+            if not isinstance(entry["headers"], dict):
+                entry["headers"] = CIMultiDict(entry["headers"])
+            await self.store(key, {**entry, **freshness})
+        return {**response, "cache_status": "miss"}
+
+    def close(self):
+        """
+        This closes the sqlite file.
+        """
+        if self.db:
+            with self.db_lock:
+                self.db.close()
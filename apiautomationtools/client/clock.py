@@ -0,0 +1,38 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+
+class MonotonicClock(object):
+    """
+    A monotonic nanosecond clock anchored once to the wall clock for display.
+    """
+
+    def __init__(self):
+        """
+        This is the constructor for MonotonicClock.
+        """
+        self.wall = datetime.now(timezone.utc)
+        self.anchor = time.perf_counter_ns()
+
+    @staticmethod
+    def now() -> int:
+        """
+        This gets the current monotonic time.
+
+        Returns:
+            now: The current time in nanoseconds.
+        """
+        return time.perf_counter_ns()
+
+    def utc(self, ns: int) -> datetime:
+        """
+        This converts a monotonic time to a utc datetime. Wall clock adjustments made after the
+        anchor don't move it.
+
+        Args:
+            ns: A monotonic time in nanoseconds from now().
+
+        Returns:
+            utc: The utc datetime.
+        """
+        return self.wall + timedelta(microseconds=(ns - self.anchor) // 1000)
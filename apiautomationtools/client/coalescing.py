@@ -0,0 +1,76 @@
+import asyncio
+from typing import Awaitable, Callable
+
+import orjson
+
+COALESCE_METHODS = ["GET", "HEAD", "OPTIONS"]
+
+
+class RequestCoalescer(object):
+    """
+    Shares one response between the identical idempotent requests of a batch that are in
+    flight at the same time.
+    """
+
+    def __init__(self):
+        """
+        This is the constructor for RequestCoalescer.
+        """
+        self.responses = {}
+
+    @staticmethod
+    def key(method: str, url: str, kwargs: dict) -> None | bytes:
+        """
+        This gets the key that identical requests share. Only GET, HEAD and OPTIONS requests
+        are coalesced.
+
+        Args:
+            method: The request method eg get.
+            url: The request url.
+            kwargs: The additional params eg headers or params etc.
+
+        Returns:
+            key: The request key, or None if the request can't be coalesced.
+        """
+        if method.upper() not in COALESCE_METHODS:
+            return None
+
+        request = {"method": method.upper(), "url": url, **kwargs}
+        return orjson.dumps(request, option=orjson.OPT_SORT_KEYS, default=str)
+
+    async def send(
+        self, key: None | bytes, send: Callable[[], Awaitable[dict]]
+    ) -> tuple[dict, bool]:
+        """
+        This sends a request, or waits for the response of the identical one sent first.
+
+        Args:
+            key: The request key from key().
+            send: Sends the request and returns its response info.
+
+        Returns:
+            response: The response info and whether it was shared eg [{'status': ...}, True].
+        """
+        if key is None:
+            return await send(), False
+        if key in self.responses:
+            return await asyncio.shield(self.responses[key]), True
+
+        future = asyncio.get_running_loop().create_future()
+        self.responses[key] = future
+        try:
+            response = await send()
+            future.set_result(response)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                # The first request was cut off, eg by its timeout, so the rest are too
+                future.set_exception(asyncio.TimeoutError())
+                future.exception()
+            # Later identical requests, eg delayed polls, are sent afresh
+            if self.responses.get(key) is future:
+                del self.responses[key]
+        return response, False
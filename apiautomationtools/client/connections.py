@@ -0,0 +1,49 @@
+import itertools
+import weakref
+from contextvars import ContextVar
+from typing import Any
+
+from aiohttp import TCPConnector
+from aiohttp.connector import Connection
+
+# The protocol of the connection the current task's last aiohttp request was sent over
+last_connection: ContextVar = ContextVar("last_connection", default=None)
+# The token of each open connection, which unlike id() isn't handed to a later connection
+connection_tokens: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+next_token = itertools.count(1)
+
+
+def connection_token(connection: None | Any) -> None | int:
+    """
+    This gets the token of a connection, to tell the connections responses came over apart.
+
+    Args:
+        connection: The connection eg an httpx response's network_stream.
+
+    Returns:
+        token: The number the connection was given the first time it was seen.
+    """
+    if connection is None:
+        return None
+    token = connection_tokens.get(connection)
+    if token is None:
+        token = connection_tokens[connection] = next(next_token)
+    return token
+
+
+class TrackingConnector(TCPConnector):
+    """
+    A TCPConnector that notes which connection each request is sent over, as aiohttp responses
+    can give their connection back to the pool before they're read.
+    """
+
+    async def connect(self, *args: Any, **kwargs: Any) -> Connection:
+        """
+        This gets a pooled or new connection for a request and notes it for the current task.
+
+        Returns:
+            connection: The connection the request is sent over.
+        """
+        connection = await super().connect(*args, **kwargs)
+        last_connection.set(connection.protocol)
+        return connection
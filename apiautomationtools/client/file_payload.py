@@ -0,0 +1,221 @@
+import contextlib
+import io
+import mmap
+import os
+import sys
+import threading
+from functools import partial
+from typing import Any, Callable
+
+from aiohttp import FormData, payload
+from aiohttp.abc import AbstractStreamWriter
+
+CHUNK_SIZE = 2**16
+# Python 3.13+ can map a file without keeping a duplicate of its descriptor
+MMAP_CONFIGS = {"trackfd": False} if sys.version_info >= (3, 13) else {}
+
+
+class MappedFile(io.RawIOBase):
+    """
+    A read-only upload file over a shared memory mapping, with its own position.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        mapping: mmap.mmap | bytes,
+        release: None | Callable[[], None] = None,
+    ):
+        """
+        This is the constructor for MappedFile.
+
+        Args:
+            name: The path of the file.
+            mapping: The shared mapping of the file's contents.
+            release: Gives the file's hold on the mapping back when it's closed.
+        """
+        super().__init__()
+        self.name = name
+        self.mapping = mapping
+        self.position = 0
+        self._release = release
+
+    def __repr__(self) -> str:
+        return f"<MappedFile name={self.name!r}>"
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def close(self):
+        """
+        This closes the file, which happens at the latest when it's garbage collected, and
+        gives back its hold on the mapping.
+        """
+        if not self.closed:
+            super().close()
+            not self._release or self._release()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        """
+        This copies the next chunk of the file into a buffer, straight from the mapping.
+
+        Args:
+            buffer: The buffer to fill.
+
+        Returns:
+            size: The number of bytes read.
+        """
+        with memoryview(self.mapping) as view:
+            chunk = view[self.position : self.position + len(buffer)]
+            buffer[: len(chunk)] = chunk
+            self.position += len(chunk)
+            return len(chunk)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        start = {os.SEEK_SET: 0, os.SEEK_CUR: self.position}.get(whence, len(self))
+        self.position = max(0, start + offset)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def view(self) -> memoryview:
+        """
+        This gets the rest of the file without copying it.
+
+        Returns:
+            view: A view of the mapping from the current position.
+        """
+        return memoryview(self.mapping)[self.position :]
+
+
+class MappedFilePayload(payload.Payload):
+    """
+    Sends a MappedFile to aiohttp in chunks straight from its mapping, with a known size.
+    """
+
+    _autoclose = True
+
+    def __init__(self, value: MappedFile, *args: Any, **kwargs: Any):
+        """
+        This is the constructor for MappedFilePayload.
+
+        Args:
+            value: The file to upload.
+        """
+        super().__init__(value, *args, **kwargs)
+        self._size = len(value) - value.tell()
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return bytes(self._value.view()).decode(encoding, errors)
+
+    async def write(self, writer: AbstractStreamWriter):
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(
+        self, writer: AbstractStreamWriter, content_length: None | int
+    ):
+        view = self._value.view()[:content_length]
+        for offset in range(0, len(view), CHUNK_SIZE):
+            await writer.write(view[offset : offset + CHUNK_SIZE])
+
+
+payload.register_payload(MappedFilePayload, MappedFile)
+
+
+class FilePayloads(object):
+    """
+    Read-only memory mappings of upload files, shared by every request that sends them. Each
+    file is closed once it's mapped, so a file holds at most one descriptor however many
+    requests send it. A mapping is counted by the files using it and unmapped, with its
+    descriptor, once the last one is closed.
+    """
+
+    def __init__(self):
+        """
+        This is the constructor for FilePayloads.
+        """
+        self.mappings = {}
+        # Reentrant, as files can be garbage collected and released while it's held
+        self.lock = threading.RLock()
+
+    def open(self, path: str) -> MappedFile:
+        """
+        This opens an upload file, mapping it the first time it's used or after it changes.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            file: The file to upload.
+        """
+        stat = os.stat(path)
+        key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            entry = self.mappings.get(key)
+            if entry is None:
+                mapping = b""
+                if stat.st_size:
+                    with open(path, "rb") as fd:
+                        mapping = mmap.mmap(
+                            fd.fileno(), 0, access=mmap.ACCESS_READ, **MMAP_CONFIGS
+                        )
+                entry = self.mappings[key] = [mapping, 0]
+            entry[1] += 1
+        return MappedFile(path, entry[0], partial(self._release, key, entry))
+
+    def _release(self, key: tuple, entry: list):
+        """
+        This gives back a file's hold on a mapping, unmapping it when no files are left.
+
+        Args:
+            key: The key of the mapping.
+            entry: The mapping and the count of files using it.
+        """
+        with self.lock:
+            entry[1] -= 1
+            if entry[1]:
+                return
+            if self.mappings.get(key) is entry:
+                del self.mappings[key]
+            if isinstance(entry[0], mmap.mmap):
+                # A view still being sent keeps the mapping until it's garbage collected
+                with contextlib.suppress(BufferError):
+                    entry[0].close()
+
+    def clear(self):
+        """
+        This forgets the mappings, which are unmapped once the files using them are closed.
+        """
+        with self.lock:
+            self.mappings = {}
+
+
+file_payloads = FilePayloads()
+
+
+def close_files(value: Any):
+    """
+    This closes the upload files of a sent request's data or files, giving back their holds on
+    the mappings.
+
+    Args:
+        value: The request's data eg FormData, or files eg [('file', MappedFile), ...].
+    """
+    if isinstance(value, MappedFile):
+        value.close()
+    elif isinstance(value, FormData):
+        # The fields become the parts of a multipart writer once the form is sent
+        close_files([field[-1] for field in value._fields])
+        close_files([part[0] for part in value._writer._parts])
+    elif isinstance(value, payload.Payload):
+        close_files(value._value)
+    elif isinstance(value, list | tuple):
+        for item in value:
+            close_files(item)
@@ -0,0 +1,146 @@
+import os
+import threading
+import uuid
+from collections import deque
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import orjson
+
+from apiautomationtools.client.record import ResponseRecord, intern_headers
+
+
+def _serializable(value: Any) -> Any:
+    """
+    This converts the values orjson can't write eg records, multidicts, bytes or FormData.
+
+    Args:
+        value: The value to convert.
+
+    Returns:
+        value: A value orjson can write.
+    """
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    return str(value)
+
+
+class BatchHistory(Sequence):
+    """
+    The results of a client's batches. With a retention policy only the latest batches are kept
+    in memory, and every batch is written to an orjson lines file that older ones are read
+    back from when they're asked for.
+    """
+
+    def __init__(
+        self,
+        max_batches: None | int = None,
+        max_bytes: None | int = None,
+        path: None | str = None,
+    ):
+        """
+        This is the constructor for BatchHistory. Without a retention policy every batch is
+        kept in memory.
+
+        Args:
+            max_batches: The most batches to keep in memory.
+            max_bytes: The most bytes of batches, as written to the file, to keep in memory.
+            path: The path of the orjson lines file that batches are written to. Each history
+                  gets a unique id added to it, so histories sharing a path don't clash.
+        """
+        self.max_batches = max_batches
+        self.max_bytes = max_bytes
+        self.spill = bool(path and (max_batches is not None or max_bytes is not None))
+        self.path = path
+        if self.spill:
+            root, ext = os.path.splitext(path)
+            self.path = f"{root}_{uuid.uuid4().hex[:12]}{ext}"
+
+        self.batches = deque()
+        self.sizes = deque()
+        self.size = 0
+        self.first = 0
+        self.offsets = []
+        self.lock = threading.Lock()
+        self._file = None
+
+    def __len__(self) -> int:
+        return self.first + len(self.batches)
+
+    def __getitem__(self, index: int | slice) -> dict | list[dict]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        index = index + len(self) if index < 0 else index
+        if not 0 <= index < len(self):
+            raise IndexError("BatchHistory index out of range")
+        with self.lock:
+            if index >= self.first:
+                return self.batches[index - self.first]
+            offset, size = self.offsets[index]
+            file = self._open()
+            file.seek(offset)
+            line = file.read(size)
+
+        batch = orjson.loads(line)
+        for i, record in enumerate(batch["responses"]):
+            if "server_headers" in record:
+                record["server_headers"] = intern_headers(record["server_headers"])
+            batch["responses"][i] = ResponseRecord(record)
+        return batch
+
+    def _open(self):
+        """
+        This opens the file of spilled batches, creating it for the first batch. It's never
+        truncated, as a file that already exists belongs to another writer.
+
+        Returns:
+            file: The file of spilled batches.
+        """
+        if self._file is None:
+            self._file = open(self.path, "a+b" if self.offsets else "x+b")
+        return self._file
+
+    def append(self, batch: dict):
+        """
+        This adds a batch's result, writing it to the file and spilling the oldest batches out
+        of memory when over the retention policy.
+
+        Args:
+            batch: The result of a batch eg {'duration': ..., 'responses': ..., 'stats': ...}.
+        """
+        with self.lock:
+            self.batches.append(batch)
+            if not self.spill:
+                return
+
+            line = orjson.dumps(
+                batch,
+                default=_serializable,
+                option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+            )
+            file = self._open()
+            offset = file.seek(0, 2)
+            file.write(line)
+            file.flush()
+            self.offsets.append((offset, len(line)))
+
+            self.sizes.append(len(line))
+            self.size += len(line)
+            while self.batches and (
+                (self.max_batches is not None and len(self.batches) > self.max_batches)
+                or (self.max_bytes is not None and self.size > self.max_bytes)
+            ):
+                self.batches.popleft()
+                self.size -= self.sizes.popleft()
+                self.first += 1
+
+    def close(self):
+        """
+        This closes the file of spilled batches, which is reopened if it's needed again.
+        """
+        with self.lock:
+            not self._file or self._file.close()
+            self._file = None
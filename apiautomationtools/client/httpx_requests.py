@@ -1,17 +1,36 @@
 import asyncio
 import os
+import sys
 import time
+import weakref
+from concurrent.futures import Future
 from copy import deepcopy
-from datetime import datetime, timezone
+from functools import partial
 from operator import itemgetter
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 
 import httpx
 import orjson
-import pypeln as pl
 
 import apiautomationtools.reporting.response_csv as rc
+from apiautomationtools.client.adaptive import AdaptiveLimit
+from apiautomationtools.client.cache import ResponseCache
+from apiautomationtools.client.clock import MonotonicClock
+from apiautomationtools.client.coalescing import RequestCoalescer
+from apiautomationtools.client.connections import connection_token
+from apiautomationtools.client.file_payload import close_files, file_payloads
+from apiautomationtools.client.history import BatchHistory
+from apiautomationtools.client.loop_runner import LoopFactory, LoopRunner
+from apiautomationtools.client.record import (BODY_MODES, PAYLOAD_KWARGS,
+                                              TIMED_OUT, ResponseRecord,
+                                              body_json, intern_headers,
+                                              request_parts,
+                                              timed_out_response)
+from apiautomationtools.client.scheduler import RequestScheduler
+from apiautomationtools.client.stream_sink import StreamSink, split_ranges
+from apiautomationtools.client.tracing import PhaseTimer
 from apiautomationtools.logging import Logger
+from apiautomationtools.reporting.histogram import BatchStats
 
 
 class HttpxRequests(object):
@@ -22,7 +41,30 @@ class HttpxRequests(object):
     client: httpx.AsyncClient | None = None
 
     def __init__(
-        self, root_dir: None | str = None, reuse: bool = False, **client_configs
+        self,
+        root_dir: None | str = None,
+        reuse: bool = False,
+        max_in_flight: int = 1000,
+        per_host: int = 0,
+        queue_size: None | int = None,
+        rate: None | float = None,
+        trace: bool = False,
+        body: str = "json",
+        coalesce: bool = False,
+        cache: None | ResponseCache = None,
+        chunk_size: int = 2**20,
+        digest: str = "sha256",
+        ranges: int = 1,
+        range_min_size: int = 16 * 2**20,
+        keep_payloads: bool = True,
+        history_batches: None | int = None,
+        history_bytes: None | int = None,
+        loop: None | str | LoopFactory = None,
+        adaptive: bool = False,
+        timeout: None | float = None,
+        deadline: None | float = None,
+        http2: bool = False,
+        **client_configs,
     ):
         """
         This is the constructor for HttpxRequests.
@@ -30,30 +72,186 @@ class HttpxRequests(object):
         Args:
             root_dir: A specified root directory.
             reuse: Whether to reuse an existing client or open and close one for each request.
+            max_in_flight: The maximum number of requests in flight at once.
+            per_host: The maximum number of requests in flight per host (0 is unlimited).
+            queue_size: The size of the scheduler's ready-queue (defaults to max_in_flight).
+            rate: An open-loop target of requests per second that replaces the delay pacing.
+            trace: Whether to add the queue, dns, connect, tls, ttfb and body timings to records.
+            body: How to handle response bodies: json decodes them, raw keeps the bytes and
+                  decodes json when it's first read, and none drains and discards them.
+            coalesce: Whether identical GET, HEAD and OPTIONS requests in flight at the same
+                      time share one response, marked in each record's coalesced field.
+            cache: A response cache, which can be shared between clients, for GET requests.
+                   Each record's cache_status field is hit, revalidated or miss.
+            chunk_size: The chunk size of stream_path downloads, which are written off the loop.
+            digest: The hashlib algorithm of the stream_digest of stream_path downloads.
+            ranges: How many parallel byte ranges to split large stream_path downloads into,
+                    when the server accepts ranges. Ranged downloads have no stream_digest.
+            range_min_size: The smallest stream_path download to split into ranges.
+            keep_payloads: Whether to keep the request bodies in each record's kwargs, which
+                           fill the report's body column. Dropping them saves memory.
+            history_batches: The most batch results to keep in memory. Every batch is then
+                             written to the client's own _history_<id>.jsonl file next to the
+                             report, which older batches are read back from.
+            history_bytes: The most bytes of batch results, as written to the history
+                           file, to keep in memory.
+            loop: The event loop that request() and submit() run batches on, by name eg
+                  asyncio or uvloop, or as a factory of loops (defaults to asyncio).
+            adaptive: Whether to adapt the requests in flight, up to max_in_flight, to the
+                      server. The limit grows while latency stays flat and backs off on 429,
+                      503 and 504 responses, errors or rising latency.
+            timeout: How long each request may take in seconds, which is also the httpx
+                     client's timeout (defaults to 300).
+            deadline: How long each batch may take in seconds. Requests still running or
+                      waiting to be sent then are cut off, so the batch returns on time.
+                      With either set, cut off requests get an actual_code of timed out and
+                      every record a timed_out field.
+            http2: Whether to multiplex requests over HTTP/2 connections (needs the h2 package).
+                   Records get the negotiated http_version and the batch stats count the
+                   streams per connection.
             client_configs: Additional configs are available here
                             https://github.com/encode/httpx/blob/5b06aea1d64f0815af6fe71da3ac725bed3ec09f/httpx/_client.py#L1291
                 app: The Python web application to send requests to.
+                http1: Whether to allow HTTP/1.1, set to False for HTTP/2 without TLS.
                 base_url: The base url to use when calling into python web apps.
                 transport: The transport class for sending requests over the network.
         """
+        if body not in BODY_MODES:
+            raise ValueError(f"body must be one of {BODY_MODES}, not {body!r}.")
+
         Logger().get_logger(root_dir=root_dir)
         self.logging = Logger()
         self.logger = self.logging.logger
         self.csv_path = self.logging.log_file_path.replace(".log", ".csv")
 
         self.reuse = reuse
-        self.client_configs = client_configs
+        self.trace = trace
+        self.body = body
+        self.coalesce = coalesce
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self.digest = digest
+        self.ranges = ranges
+        self.range_min_size = range_min_size
+        self.keep_payloads = keep_payloads
+        self.http2 = http2
+        self.clock = MonotonicClock()
+        self.runner = LoopRunner(loop)
+        weakref.finalize(self, self.runner.stop)
+        self.adaptive = adaptive
+        self.timeout = timeout
+        self.deadline = deadline
+        self.scheduler = RequestScheduler(max_in_flight, per_host, queue_size, rate)
+        self.client_configs = {
+            "limits": httpx.Limits(max_connections=self.scheduler.max_in_flight),
+            "http2": http2,
+            "timeout": 300 if timeout is None else timeout,
+            **client_configs,
+        }
+        self._client_loop = None
+        self.warm_connections = None
         self.batch_number = 0
-        self._return = []
-        self._return_history = []
+        self._return_history = BatchHistory(
+            history_batches,
+            history_bytes,
+            self.csv_path.replace(".csv", "_history.jsonl"),
+        )
+
+    async def open(self) -> httpx.AsyncClient:
+        """
+        This will open an httpx client, or return the open one bound to the running loop. One
+        bound to another loop is closed on that loop if it's still running, or else let go.
+
+        Returns:
+            client: The request making client object.
+        """
+        loop = asyncio.get_running_loop()
+        if self.client and not self.client.is_closed and self._client_loop is not loop:
+            # Its connections belong to the loop it was opened on, so it's closed there while
+            # that loop runs, and otherwise let go as they went with the loop
+            client, self.client = self.client, None
+            if self._client_loop.is_running():
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(client.aclose(), self._client_loop)
+                )
+        if not self.client or self.client.is_closed:
+            self.client = httpx.AsyncClient(**self.client_configs)
+            self._client_loop = loop
+        return self.client
 
     async def close(self):
         """
         This will close the httpx client connection.
         """
-        if self.client:
+        on_runner = self.runner.running and self._client_loop is self.runner.loop
+        if (
+            self.client
+            and on_runner
+            and self.runner.loop is not asyncio.get_running_loop()
+        ):
+            await asyncio.wrap_future(self.runner.submit(self.close()))
+        elif self.client and self._client_loop.is_closed():
+            # Its loop has finished, and its connections with it, so it's only let go
+            self.client = None
+            self._client_loop = None
+        elif self.client:
             await self.client.aclose()
             self.client = None
+            self._client_loop = None
+
+    def shutdown(self):
+        """
+        This will close the httpx client and stop the client's background event loop.
+        """
+        if self.runner.running:
+            self.runner.run(self.close())
+            self.runner.stop()
+
+    async def async_warmup(
+        self, hosts: list[str] | str, connections: int = 1, path: str = "/"
+    ):
+        """
+        This opens connections to each host ahead of a timed batch and keeps them in the pool,
+        so the batch doesn't pay for connection setup. Records then say whether they were sent
+        over one of them in their warm field.
+
+        Args:
+            hosts: The hosts to connect to eg https://httpbin.org.
+            connections: The number of connections to open to each host.
+            path: The path of the HEAD requests that open the connections.
+        """
+        if not self.reuse:
+            raise ValueError(
+                "Warming up connections needs reuse=True to keep them open."
+            )
+        client = await self.open()
+        if self.warm_connections is None:
+            self.warm_connections = weakref.WeakSet()
+
+        async def connect(url: str):
+            response = await client.head(url)
+            self.warm_connections.add(response.extensions.get("network_stream"))
+
+        hosts = [hosts] if type(hosts) is str else hosts
+        await asyncio.gather(
+            *[
+                connect(f"{host.rstrip('/')}{path}")
+                for host in hosts
+                for _ in range(connections)
+            ]
+        )
+        self.logger.info("Warmed up %s connections to each of %s.", connections, hosts)
+
+    def warmup(self, hosts: list[str] | str, connections: int = 1, path: str = "/"):
+        """
+        This opens connections to each host ahead of a timed batch on the client's loop.
+
+        Args:
+            hosts: The hosts to connect to eg https://httpbin.org.
+            connections: The number of connections to open to each host.
+            path: The path of the HEAD requests that open the connections.
+        """
+        self.runner.run(self.async_warmup(hosts, connections, path))
 
     @staticmethod
     def separate_form_data(**kwargs: Any) -> dict:
@@ -73,9 +271,11 @@ class HttpxRequests(object):
                 if type(value) is not list:
                     value = [value]
                 body["files"] = [
-                    (key, open(f, "rb"))
-                    if isinstance(f, str | bytes) and os.path.exists(f)
-                    else f
+                    (
+                        (key, file_payloads.open(f))
+                        if isinstance(f, str | bytes) and os.path.exists(f)
+                        else f
+                    )
                     for f in value
                 ]
             else:
@@ -103,6 +303,10 @@ class HttpxRequests(object):
         if type(data) is not list:
             data = [data]
 
+        # Entries share their headers and bodies, eg from generate_batch, so they're copied
+        # once per batch through a shared memo rather than once per entry. Each record then
+        # gets its own copy as it's made, so records don't share them
+        memo = {}
         agg_delay = 0
         for i in range(len(data)):
             agg_delay += delay
@@ -114,9 +318,10 @@ class HttpxRequests(object):
                 if f_file:
                     f_data[field] = f_file
 
-            d = deepcopy(d)
+            d = {k: deepcopy(v, memo) for k, v in d.items()}
             d["delay"] = round(agg_delay, 2)
             d["index"] = i
+            d["batch_number"] = self.batch_number
 
             if f_data:
                 body = f_data
@@ -126,16 +331,149 @@ class HttpxRequests(object):
 
             data[i] = d
 
-        kwargs = deepcopy(kwargs)
+        kwargs = deepcopy(kwargs, memo)
         return [data, kwargs]
 
-    async def _request(self, client: httpx.AsyncClient, data: dict, **kwargs: Any):
+    async def _read_range(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        sink: StreamSink,
+        start: int,
+        end: int,
+        **kwargs: Any,
+    ):
+        """
+        This downloads a byte range of a ranged stream_path download into its sink.
+
+        Args:
+            client: The request making client object.
+            url: The request url.
+            sink: The sink of the download.
+            start: The offset of the range.
+            end: The end of the range.
+            **kwargs: The additional params eg headers or params etc.
+        """
+        headers = {
+            **(kwargs.pop("headers", None) or {}),
+            "Range": f"bytes={start}-{end - 1}",
+        }
+        async with client.stream("GET", url, headers=headers, **kwargs) as response:
+            if response.status_code != 206:
+                raise ValueError(
+                    f"{url} returned {response.status_code} for a range request."
+                )
+            chunks = response.aiter_bytes(self.chunk_size)
+            await sink.write_range(chunks, start, end)
+
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        stream_path: str = "",
+        timer: None | PhaseTimer = None,
+        **kwargs: Any,
+    ) -> dict:
+        """
+        This sends a request and reads its response.
+
+        Args:
+            client: The request making client object.
+            method: The request method eg GET.
+            url: The request url.
+            stream_path: The path to stream the response body to.
+            timer: The phase timer of the request.
+            **kwargs: The additional params eg headers or data etc.
+
+        Returns:
+            response: The response info eg {'status': ..., 'headers': ..., 'json': ..., ...}.
+        """
+        request_kwargs = kwargs
+        if timer:
+            extensions = {"trace": timer.httpx_trace, **kwargs.get("extensions", {})}
+            request_kwargs = {**kwargs, "extensions": extensions}
+
+        async with client.stream(method, url, **request_kwargs) as response:
+            t1 = self.clock.now()
+
+            content = None
+            _json = ""
+            stream = {}
+            if stream_path:
+                parts = []
+                if (
+                    method.upper() == "GET"
+                    and response.status_code == 200
+                    and self.ranges > 1
+                ):
+                    parts = split_ranges(
+                        response.headers, self.ranges, self.range_min_size
+                    )
+
+                digest = None if parts else self.digest
+                size = parts[-1][1] if parts else None
+                async with StreamSink(stream_path, digest, size) as sink:
+                    if parts:
+                        read_range = partial(
+                            self._read_range, client, url, sink, **kwargs
+                        )
+                        await sink.write_ranges(
+                            parts, response.aiter_bytes(self.chunk_size), read_range
+                        )
+                    else:
+                        async for chunk in response.aiter_bytes(self.chunk_size):
+                            await sink.write(chunk)
+                stream = sink.summary()
+            elif self.body == "none":
+                async for _ in response.aiter_raw():
+                    pass
+            elif self.body == "raw" or self.cache:
+                content = await response.aread()
+                _json = body_json(content, response.charset_encoding, self.body)
+            else:
+                await response.aread()
+                _json = response.text
+                try:
+                    _json = orjson.loads(_json)
+                except Exception:
+                    pass
+            not timer or timer.mark("body_end")
+
+        network_stream = response.extensions.get("network_stream")
+        return {
+            "method": sys.intern(method),
+            "status": sys.intern(str(response.status_code)),
+            "headers": intern_headers(response.headers),
+            "json": _json,
+            "content": content,
+            "encoding": response.charset_encoding,
+            "t1": t1,
+            "timings": timer and timer.phases(),
+            "stream": stream,
+            "http_version": response.http_version,
+            "connection": connection_token(network_stream),
+            "warm": network_stream in (self.warm_connections or ()),
+        }
+
+    async def _request(
+        self,
+        client: httpx.AsyncClient,
+        data: dict,
+        stats: None | BatchStats = None,
+        coalescer: None | RequestCoalescer = None,
+        deadline: None | float = None,
+        **kwargs: Any,
+    ) -> dict:
         """
         This makes the individual requests.
 
         Args:
             client: The request making client object.
             data: The info needed to make the request eg {'url': ..., 'method': 'get'}.
+            stats: The batch stats to record the response in.
+            coalescer: The batch's coalescer of identical requests.
+            deadline: The loop time the batch must finish by.
             **kwargs: The additional params eg headers or data etc. See
                 https://github.com/encode/httpx/blob/5b06aea1d64f0815af6fe71da3ac725bed3ec09f/httpx/_client.py#L1481
                 for more details.
@@ -149,79 +487,154 @@ class HttpxRequests(object):
         delay = kwargs.pop("delay", 0)
         stream_path = kwargs.pop("stream_path", "")
         index = kwargs.pop("index", 0)
+        batch_number = kwargs.pop("batch_number", self.batch_number)
+        schedule = {
+            k: kwargs.pop(k)
+            for k in ["scheduled_seconds", "send_lag_seconds"]
+            if k in kwargs
+        }
 
-        self.logger.info(f"Making the request with {data}.")
-        not delay or await asyncio.sleep(delay)
-
-        t0 = datetime.utcnow().replace(tzinfo=timezone.utc)
-        response = await client.request(method, url, **kwargs)
-
-        t1 = datetime.utcnow().replace(tzinfo=timezone.utc)
-        response_seconds = round((t1 - t0).total_seconds(), 2)
-
-        if stream_path:
-            with open(stream_path, "wb") as fd:
-                async for content in response.aiter_bytes(1024):
-                    fd.write(content)
-
-        _json = response.text
+        self.logger.info("Making the request with %s.", data)
+
+        key = None
+        if coalescer and not stream_path:
+            key = coalescer.key(method, url, kwargs)
+        cache_key = None
+        if self.cache and not stream_path and self.body != "none":
+            cache_key = self.cache.key(method, url, kwargs)
+
+        timer = PhaseTimer() if self.trace else None
+        not timer or timer.mark("start")
+        t0 = self.clock.now()
+        send = partial(self._send, client, method, url, stream_path, timer, **kwargs)
+        if cache_key:
+            headers = kwargs.get("headers")
+            send = partial(self.cache.send, cache_key, send, headers, self.body)
+        sending = coalescer.send(key, send) if coalescer else send()
+        timeout = self.scheduler.remaining(self.timeout, deadline)
         try:
-            _json = orjson.loads(_json)
-        except Exception:
-            pass
+            response = await asyncio.wait_for(sending, timeout)
+            response, coalesced = response if coalescer else (response, False)
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            response, coalesced = timed_out_response(method, self.clock.now()), False
+        finally:
+            close_files([kwargs.get("data"), kwargs.get("files")])
+        t1 = self.clock.now() if coalesced else response["t1"]
+        latency = t1 - t0
 
         code_mismatch = ""
-        if code and str(code).split("|")[0] != str(response.status_code):
+        if code and str(code).split("|")[0] != response["status"]:
             code_mismatch = "X"
 
-        self._return += [
-            {
-                "description": description,
-                "code_mismatch": code_mismatch,
-                "batch_number": self.batch_number,
-                "index": index + 1,
-                "method": method,
-                "expected_code": code,
-                "actual_code": str(response.status_code),
-                "json": _json,
-                "url": url,
-                "server_headers": dict(response.headers),
-                "response_seconds": response_seconds,
-                "delay_seconds": delay,
-                "utc_time": t1.isoformat(),
-                "headers": kwargs.pop("headers"),
-                "kwargs": kwargs,
-            }
-        ]
+        headers = kwargs.pop("headers")
+        if not self.keep_payloads:
+            kwargs = {k: v for k, v in kwargs.items() if k not in PAYLOAD_KWARGS}
+        headers, kwargs = request_parts(headers, kwargs)
+
+        content = response["content"] if self.body == "raw" else None
+        record = {
+            "description": description,
+            "code_mismatch": code_mismatch,
+            "batch_number": batch_number,
+            "index": index + 1,
+            "method": response["method"],
+            "expected_code": code,
+            "actual_code": response["status"],
+            "json": response["json"],
+            "url": url,
+            "server_headers": response["headers"],
+            "response_seconds": latency / 1e9,
+            "delay_seconds": delay,
+            "utc_time": self.clock.utc(t1).isoformat(),
+            "headers": headers,
+            "kwargs": kwargs,
+        }
+        record = ResponseRecord(record, content, response["encoding"])
+        if coalescer:
+            record["coalesced"] = coalesced
+        if self.cache:
+            record["cache_status"] = response.get("cache_status")
+        if self.warm_connections is not None:
+            record["warm"] = response.get("warm", False)
+        if self.timeout is not None or self.deadline is not None:
+            record["timed_out"] = response["status"] == TIMED_OUT
+        if self.http2:
+            record["http_version"] = response.get("http_version")
         if stream_path:
-            self._return[-1]["stream_path"] = stream_path
+            record["stream_path"] = stream_path
+            record.update(response["stream"])
+        record.update(schedule)
+        if timer:
+            record["timings"] = response["timings"]
+
+        connection = response.get("connection") if self.http2 else None
+        not stats or stats.record(record, latency, connection)
+        self.logger.info("Made the request with %s \n returning %s.", data, record)
+        return record
+
+    async def _stream(
+        self,
+        data: list[dict],
+        ordered: bool = False,
+        stats: None | BatchStats = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[dict]:
+        """
+        This runs the prepped data through the scheduler and yields each response record.
 
-        self.logger.info(
-            f"Made the request with {data} \n returning {self._return[-1]}."
-        )
+        Args:
+            data: The prepped info needed to make the request eg [{'url': ..., 'method': 'get'}].
+            ordered: Whether to yield in index order instead of completion order.
+            stats: The batch stats to record the responses in.
+            **kwargs: The additional params eg headers or data etc.
+
+        Returns:
+            records: The response records.
+        """
+        if self.reuse:
+            client = await self.open()
+        else:
+            client = httpx.AsyncClient(**self.client_configs)
+
+        coalescer = RequestCoalescer() if self.coalesce else None
+        limit = AdaptiveLimit(self.scheduler.max_in_flight) if self.adaptive else None
+        not (limit and stats) or stats.limits.append(limit.history)
+        deadline = None
+        if self.deadline is not None:
+            deadline = asyncio.get_running_loop().time() + self.deadline
+        try:
+            async for record in self.scheduler.stream(
+                lambda d: self._request(
+                    client, d, stats, coalescer, deadline, **kwargs
+                ),
+                data,
+                ordered,
+                limit,
+                deadline,
+            ):
+                yield record
+        finally:
+            if not self.reuse:
+                await client.aclose()
 
-    async def each_request(self, data: list[dict], **kwargs: Any) -> Any:
+    async def each_request(
+        self, data: list[dict], stats: None | BatchStats = None, **kwargs: Any
+    ) -> list[dict]:
         """
         The looping wrapper for _request.
 
         Args:
             data: The list of info needed to make the request eg [{'url': ..., 'method': 'get'}].
+            stats: The batch stats to record the responses in.
             **kwargs: The additional params eg headers or data etc. See
                 https://github.com/encode/httpx/blob/5b06aea1d64f0815af6fe71da3ac725bed3ec09f/httpx/_client.py#L1291
                 for more details.
-        """
-        try:
-            if not self.client:
-                self.client = httpx.AsyncClient(timeout=300, **self.client_configs)
 
-            return await pl.task.each(
-                lambda d: self._request(self.client, d, **kwargs),
-                data,
-                workers=len(data),
-            )
-        finally:
-            if not self.reuse:
-                await self.close()
+        Returns:
+            responses: The response records in completion order.
+        """
+        records = self._stream(data, stats=stats, **kwargs)
+        return [record async for record in records]
 
     def request(
         self,
@@ -241,27 +654,31 @@ class HttpxRequests(object):
                 https://github.com/encode/httpx/blob/5b06aea1d64f0815af6fe71da3ac725bed3ec09f/httpx/_client.py#L1481
                 for more details.
         Returns:
-            responses: The global response object eg {'duration': ..., 'responses': ...}.
+            responses: The global response object eg {'duration': ..., 'responses': ..., 'stats': ...}.
         """
-        self.batch_number += 1
-        data, kwargs = self.build_request_info(data, delay, **kwargs)
-
-        each = self.each_request(data, **kwargs)
-        t0 = time.time()
-        asyncio.run(each)
-        t1 = time.time()
+        return self.runner.run(self.async_request(data, delay, report, **kwargs))
 
-        _return = {
-            "duration": round(t1 - t0, 2),
-            "responses": sorted(self._return, key=itemgetter("index")),
-        }
-        self._return_history.append(_return)
-        self._return = []
-        self.logger.info(f'The batch duration was {_return["duration"]} seconds.')
+    def submit(
+        self,
+        data: list[dict] | dict,
+        delay: int | float = 0,
+        report: bool = True,
+        **kwargs: Any,
+    ) -> Future:
+        """
+        This submits the requests batch to the client's background event loop.
 
-        if _return["responses"]:
-            not report or rc.create_csv_report(self.csv_path, _return, scrub=True)
-        return _return
+        Args:
+            data: The list of info needed to make the request eg [{'url': ..., 'method': 'get'}].
+            delay: How long to delay between requests.
+            report: Whether to create or update a report with the current responses.
+            **kwargs: The additional params eg headers or data etc. See
+                https://github.com/encode/httpx/blob/5b06aea1d64f0815af6fe71da3ac725bed3ec09f/httpx/_client.py#L1481
+                for more details.
+        Returns:
+            future: The future of the global response object eg {'duration': ..., 'responses': ..., 'stats': ...}.
+        """
+        return self.runner.submit(self.async_request(data, delay, report, **kwargs))
 
     async def async_request(
         self,
@@ -281,23 +698,74 @@ class HttpxRequests(object):
                 https://github.com/encode/httpx/blob/5b06aea1d64f0815af6fe71da3ac725bed3ec09f/httpx/_client.py#L1481
                 for more details.
         Returns:
-            responses: The global response object eg {'duration': ..., 'responses': ...}.
+            responses: The global response object eg {'duration': ..., 'responses': ..., 'stats': ...}.
         """
         self.batch_number += 1
         data, kwargs = self.build_request_info(data, delay, **kwargs)
 
-        t0 = time.time()
-        await self.each_request(data, **kwargs)
-        t1 = time.time()
+        stats = BatchStats()
+        t0 = time.perf_counter()
+        responses = await self.each_request(data, stats, **kwargs)
+        t1 = time.perf_counter()
 
         _return = {
             "duration": round(t1 - t0, 2),
-            "responses": sorted(self._return, key=itemgetter("index")),
+            "responses": sorted(responses, key=itemgetter("index")),
+            "stats": stats.summary(t1 - t0),
         }
         self._return_history.append(_return)
-        self._return = []
-        self.logger.info(f'The batch duration was {_return["duration"]} seconds.')
+        self.logger.info("The batch duration was %s seconds.", _return["duration"])
 
         if _return["responses"]:
             not report or rc.create_csv_report(self.csv_path, _return, scrub=True)
         return _return
+
+    async def stream(
+        self,
+        data: list[dict] | dict,
+        delay: int | float = 0,
+        ordered: bool = False,
+        **kwargs: Any,
+    ) -> AsyncIterator[dict]:
+        """
+        The streaming executor for the async requests batch. Records are yielded as they
+        complete and aren't kept, reported or added to the history.
+
+        Args:
+            data: The list of info needed to make the request eg [{'url': ..., 'method': 'get'}].
+            delay: How long to delay between requests.
+            ordered: Whether to yield in index order instead of completion order.
+            **kwargs: The additional params eg headers or data etc. See
+                https://github.com/encode/httpx/blob/5b06aea1d64f0815af6fe71da3ac725bed3ec09f/httpx/_client.py#L1481
+                for more details.
+        Returns:
+            records: The response records eg {'description': ..., 'actual_code': ..., ...}.
+        """
+        self.batch_number += 1
+        data, kwargs = self.build_request_info(data, delay, **kwargs)
+
+        async for record in self._stream(data, ordered, **kwargs):
+            yield record
+
+    def iter_request(
+        self,
+        data: list[dict] | dict,
+        delay: int | float = 0,
+        ordered: bool = False,
+        **kwargs: Any,
+    ) -> Iterator[dict]:
+        """
+        The streaming executor for the requests batch. Records are yielded as they complete
+        and aren't kept, reported or added to the history.
+
+        Args:
+            data: The list of info needed to make the request eg [{'url': ..., 'method': 'get'}].
+            delay: How long to delay between requests.
+            ordered: Whether to yield in index order instead of completion order.
+            **kwargs: The additional params eg headers or data etc. See
+                https://github.com/encode/httpx/blob/5b06aea1d64f0815af6fe71da3ac725bed3ec09f/httpx/_client.py#L1481
+                for more details.
+        Returns:
+            records: The response records eg {'description': ..., 'actual_code': ..., ...}.
+        """
+        return self.runner.iterate(self.stream(data, delay, ordered, **kwargs))
@@ -0,0 +1,171 @@
+import asyncio
+import importlib
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Callable, Coroutine, Iterator
+
+LoopFactory = Callable[[], asyncio.AbstractEventLoop]
+# The modules with a new_event_loop() that loops can be chosen from by name
+LOOPS = {"asyncio": "asyncio", "uvloop": "uvloop"}
+
+
+def loop_factory(loop: None | str | LoopFactory = None) -> LoopFactory:
+    """
+    This gets the factory of an event loop implementation.
+
+    Args:
+        loop: The name of the loop eg asyncio or uvloop, or a factory of loops (defaults to
+              asyncio).
+
+    Returns:
+        factory: The function that makes new loops.
+    """
+    if callable(loop):
+        return loop
+    module = LOOPS.get(loop or "asyncio")
+    if module is None:
+        raise ValueError(f"The loop {loop} isn't one of {list(LOOPS)}.")
+    try:
+        return importlib.import_module(module).new_event_loop
+    except ImportError as e:
+        raise ImportError(f"The {loop} loop needs pip install {module}.") from e
+
+
+def run(coro: Coroutine, loop: None | str | LoopFactory = None) -> Any:
+    """
+    This runs a coroutine to completion on a new loop, like asyncio.run, for the async entry
+    points eg run(async_requests.async_request(batch), loop="uvloop").
+
+    Args:
+        coro: The coroutine to run.
+        loop: The name of the loop eg asyncio or uvloop, or a factory of loops.
+
+    Returns:
+        result: The result of the coroutine.
+    """
+    new_loop = loop_factory(loop)()
+    try:
+        asyncio.set_event_loop(new_loop)
+        return new_loop.run_until_complete(coro)
+    finally:
+        try:
+            new_loop.run_until_complete(new_loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            new_loop.close()
+
+
+class LoopRunner(object):
+    """
+    Owns one event loop on a dedicated thread for submitting coroutines from synchronous code.
+    """
+
+    def __init__(self, loop: None | str | LoopFactory = None):
+        """
+        This is the constructor for LoopRunner.
+
+        Args:
+            loop: The name of the loop eg asyncio or uvloop, or a factory of loops.
+        """
+        self.loop_factory = loop_factory(loop)
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """
+        This checks whether the loop thread is running.
+
+        Returns:
+            running: Whether the loop thread is running.
+        """
+        return bool(self.thread and self.thread.is_alive())
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        This starts the loop thread if it isn't running yet.
+
+        Returns:
+            loop: The event loop owned by the runner.
+        """
+        with self._lock:
+            if not self.running:
+                self.loop = self.loop_factory()
+                self.thread = threading.Thread(
+                    target=self._run, name="LoopRunner", daemon=True
+                )
+                self.thread.start()
+        return self.loop
+
+    def _run(self):
+        """
+        This runs the loop on the current thread until it's stopped.
+        """
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        This submits a coroutine to the runner's loop.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            future: The future holding the coroutine's result.
+        """
+        loop = self.start()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Coroutine) -> Any:
+        """
+        This runs a coroutine on the runner's loop and waits for its result.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            result: The result of the coroutine.
+        """
+        if self.running and threading.current_thread() is self.thread:
+            coro.close()
+            raise RuntimeError("LoopRunner.run can't be called from its own loop.")
+        return self.submit(coro).result()
+
+    def iterate(self, agen: AsyncIterator) -> Iterator:
+        """
+        This iterates an async generator on the runner's loop from synchronous code.
+
+        Args:
+            agen: The async generator to iterate.
+
+        Returns:
+            items: The items of the async generator.
+        """
+
+        async def anext() -> Any:
+            return await agen.__anext__()
+
+        try:
+            while True:
+                try:
+                    yield self.run(anext())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.run(agen.aclose())
+
+    def stop(self):
+        """
+        This stops the loop and waits for its thread to finish.
+        """
+        with self._lock:
+            if self.running:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                threading.current_thread() is self.thread or self.thread.join()
+            self.thread = None
@@ -0,0 +1,257 @@
+from collections.abc import Iterator, MutableMapping
+from copy import deepcopy
+from typing import Any, Callable
+
+import orjson
+from multidict import CIMultiDict, istr
+
+BODY_MODES = ["json", "raw", "none"]
+# The report columns every record has, in order
+FIELDS = (
+    "description",
+    "code_mismatch",
+    "batch_number",
+    "index",
+    "method",
+    "expected_code",
+    "actual_code",
+    "json",
+    "url",
+    "server_headers",
+    "response_seconds",
+    "delay_seconds",
+    "utc_time",
+    "headers",
+    "kwargs",
+)
+# The request kwargs that carry bodies, which records can drop
+PAYLOAD_KWARGS = ["json", "data", "content", "files"]
+# The request kwargs that carry forms and files, which records keep as they were sent
+FORM_KWARGS = ["data", "files"]
+# The most header names and values to share, which keeps the tables bounded over long runs
+MAX_SHARED = 4096
+# The header names and values seen so far, shared by the records' headers
+HEADER_NAMES = {}
+HEADER_VALUES = {}
+# The response headers whose values rarely repeat, so they aren't shared
+UNSHARED_HEADERS = {"date", "etag", "expires", "last-modified", "set-cookie"}
+# The actual_code of requests cut off by their timeout or the batch deadline
+TIMED_OUT = "timed out"
+
+
+def decode_body(content: bytes, encoding: None | str = None) -> Any:
+    """
+    This decodes a response body the way the clients do, as json or else as text.
+
+    Args:
+        content: The raw response body.
+        encoding: The response's charset (defaults to utf-8).
+
+    Returns:
+        body: The decoded body eg {'args': ...} or the text.
+    """
+    try:
+        return orjson.loads(content)
+    except Exception:
+        return content.decode(encoding or "utf-8", errors="replace")
+
+
+def timed_out_response(method: str, t1: int) -> dict:
+    """
+    This builds the response info of a request cut off by its timeout or the batch deadline.
+
+    Args:
+        method: The request method eg get.
+        t1: The clock time the request was cut off at.
+
+    Returns:
+        response: The response info eg {'status': 'timed out', 'headers': ..., ...}.
+    """
+    return {
+        "method": method.upper(),
+        "status": TIMED_OUT,
+        "headers": CIMultiDict(),
+        "json": "",
+        "content": None,
+        "encoding": None,
+        "t1": t1,
+        "timings": None,
+        "stream": {},
+        "warm": False,
+    }
+
+
+def body_json(content: bytes, encoding: None | str = None, body: str = "json") -> Any:
+    """
+    This gets the json field of a record from a raw response body.
+
+    Args:
+        content: The raw response body.
+        encoding: The response's charset (defaults to utf-8).
+        body: The client's body mode eg json, raw or none.
+
+    Returns:
+        body: The decoded body, or the raw body for raw mode and nothing for none mode.
+    """
+    if body == "none":
+        return ""
+    if body == "raw":
+        return content
+    return decode_body(content, encoding)
+
+
+def request_parts(headers: Any, kwargs: dict) -> tuple[Any, dict]:
+    """
+    This copies a request's headers and kwargs for its record. The prepared entries of a batch
+    share them, so each record gets its own copy to change.
+
+    Args:
+        headers: The request headers.
+        kwargs: The additional params eg json or params etc.
+
+    Returns:
+        parts: The record's headers and kwargs.
+    """
+    memo = {}
+    kwargs = {
+        k: v if k in FORM_KWARGS else deepcopy(v, memo) for k, v in kwargs.items()
+    }
+    return deepcopy(headers, memo), kwargs
+
+
+def shared(table: dict, value: Any, make: Callable[[Any], Any] = str) -> Any:
+    """
+    This gets the shared copy of a value, adding it to the table while there's room.
+
+    Args:
+        table: The shared copies eg HEADER_NAMES.
+        value: The value eg a header name.
+        make: Makes the shared copy of a value that isn't in the table eg istr.
+
+    Returns:
+        value: The shared copy, or a copy of its own once the table is full.
+    """
+    copy = table.get(value)
+    if copy is None:
+        copy = make(value)
+        len(table) >= MAX_SHARED or table.setdefault(value, copy)
+    return copy
+
+
+def intern_headers(headers: Any) -> CIMultiDict:
+    """
+    This copies response headers with shared names and values, so records share one copy of
+    each header name and of repeated values eg the content type. Up to MAX_SHARED of each are
+    shared, and values that rarely repeat eg the date aren't.
+
+    Args:
+        headers: The response headers eg a CIMultiDictProxy or httpx.Headers.
+
+    Returns:
+        headers: The case-insensitive headers.
+    """
+    interned = CIMultiDict()
+    for name, value in headers.items():
+        name = shared(HEADER_NAMES, name, istr)
+        if name.lower() not in UNSHARED_HEADERS:
+            value = shared(HEADER_VALUES, value)
+        interned.add(name, value)
+    return interned
+
+
+class ResponseRecord(MutableMapping):
+    """
+    A compact response record with a slot per report column and a dict only for any extra
+    fields. A raw body is kept and its json field is decoded when it's first read. It's a
+    mapping rather than a dict, so it's copied into one with copy() eg for json.dumps.
+    """
+
+    __slots__ = FIELDS + ("extra", "content", "encoding", "_decoded")
+
+    def __init__(
+        self, record: dict, content: None | bytes = None, encoding: None | str = None
+    ):
+        """
+        This is the constructor for ResponseRecord. With a raw body the json field holds it
+        until it's decoded, so logging a record doesn't decode it.
+
+        Args:
+            record: The response record eg {'description': ..., 'actual_code': ..., ...}.
+            content: The raw response body.
+            encoding: The response's charset (defaults to utf-8).
+        """
+        self.extra = None
+        self.content = content
+        self.encoding = encoding
+        self._decoded = content is None
+        for key, value in record.items():
+            self[key] = value
+        if content is not None:
+            self.json = content
+            self._decoded = False
+
+    def _decode(self):
+        """
+        This decodes the json field the first time it's needed.
+        """
+        if not self._decoded:
+            self._decoded = True
+            self.json = decode_body(self.content, self.encoding)
+
+    def _raw_items(self) -> Iterator[tuple]:
+        """
+        This gets the fields without decoding the json field.
+
+        Returns:
+            items: The record's keys and values.
+        """
+        for key in FIELDS:
+            try:
+                yield key, getattr(self, key)
+            except AttributeError:
+                pass
+        yield from (self.extra or {}).items()
+
+    def __getitem__(self, key: Any) -> Any:
+        if key in FIELDS:
+            key != "json" or self._decode()
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key: Any, value: Any):
+        if key in FIELDS:
+            if key == "json":
+                self._decoded = True
+            setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key: Any):
+        if key in FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is None:
+            raise KeyError(key)
+        else:
+            del self.extra[key]
+
+    def __iter__(self) -> Iterator:
+        return (key for key, _ in self._raw_items())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._raw_items())
+
+    def __repr__(self) -> str:
+        return repr(dict(self._raw_items()))
+
+    def copy(self) -> dict:
+        return dict(self.items())
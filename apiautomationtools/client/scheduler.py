@@ -0,0 +1,281 @@
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+from urllib.parse import urlparse
+
+from apiautomationtools.client.adaptive import AdaptiveLimit
+
+_DONE = object()
+
+
+class RequestScheduler(object):
+    """
+    Bounded-concurrency executor for a batch of requests.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 1000,
+        per_host: int = 0,
+        queue_size: None | int = None,
+        rate: None | float = None,
+    ):
+        """
+        This is the constructor for RequestScheduler.
+
+        Args:
+            max_in_flight: The maximum number of requests in flight across all hosts.
+            per_host: The maximum number of requests in flight per host (0 is unlimited).
+                Entries wait in a queue per host, of up to queue_size, for their host's room
+                before they take a worker, so a busy host doesn't hold up the others.
+            queue_size: The size of the ready-queue feeding the workers (defaults to max_in_flight).
+            rate: An open-loop target of requests per second. When set, each entry is released
+                on a fixed timer regardless of earlier responses or busy workers, and is given
+                its scheduled_seconds and send_lag_seconds. The lag is how long it then waited
+                under max_in_flight and per_host.
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.per_host = per_host
+        self.queue_size = queue_size or self.max_in_flight
+        self.rate = rate
+
+    @staticmethod
+    def host(data: dict) -> str:
+        """
+        This gets the host a request is bound for.
+
+        Args:
+            data: The info needed to make the request eg {'url': ..., 'method': 'get'}.
+
+        Returns:
+            host: The network location of the request url.
+        """
+        return urlparse(str(data.get("url", ""))).netloc
+
+    @staticmethod
+    def remaining(timeout: None | float, deadline: None | float) -> None | float:
+        """
+        This gets how long a request may take, from its timeout and the batch deadline.
+
+        Args:
+            timeout: The per request timeout in seconds.
+            deadline: The loop time the batch must finish by.
+
+        Returns:
+            timeout: The seconds the request has left, or None when it's unlimited.
+        """
+        if deadline is None:
+            return timeout
+        left = max(0, deadline - asyncio.get_running_loop().time())
+        return left if timeout is None else min(timeout, left)
+
+    async def each(
+        self, worker: Callable[[dict], Awaitable[Any]], data: Iterable[dict]
+    ):
+        """
+        This runs the worker over the data with a fixed pool of workers fed by a bounded queue.
+
+        Args:
+            worker: The coroutine function that makes an individual request.
+            data: The list of info needed to make the request eg [{'url': ..., 'method': 'get'}].
+        """
+        async for _ in self.stream(worker, data):
+            pass
+
+    async def stream(
+        self,
+        worker: Callable[[dict], Awaitable[Any]],
+        data: Iterable[dict],
+        ordered: bool = False,
+        limit: None | AdaptiveLimit = None,
+        deadline: None | float = None,
+    ) -> AsyncIterator[Any]:
+        """
+        This runs the worker over the data and yields each result as soon as it's available.
+
+        Args:
+            worker: The coroutine function that makes an individual request.
+            data: The list of info needed to make the request eg [{'url': ..., 'method': 'get'}].
+            ordered: Whether to yield in data order through a reorder buffer instead of
+                completion order. The buffer is bounded by queue_size + max_in_flight.
+            limit: An adaptive limit on the requests in flight, under max_in_flight, which is
+                   fed the latency and throttling of each result.
+            deadline: The loop time the batch must finish by. Delayed entries aren't held past
+                      it, so the worker can cut them off on time.
+
+        Returns:
+            results: The worker results.
+        """
+        workers = self.max_in_flight
+        if hasattr(data, "__len__"):
+            workers = min(workers, len(data))
+        if not workers:
+            return
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        results = asyncio.Queue(maxsize=self.queue_size)
+        window = asyncio.Semaphore(self.queue_size + workers) if ordered else None
+        in_flight = asyncio.Semaphore(workers)
+        host_limits, host_queues, feeders = {}, {}, []
+
+        async def wait(offset: float):
+            release = start + offset
+            if deadline is not None:
+                release = min(release, deadline)
+            not offset or await asyncio.sleep(release - loop.time())
+
+        def host_limit(d: dict) -> None | asyncio.Semaphore:
+            if not self.per_host:
+                return None
+
+            host = self.host(d)
+            if host not in host_limits:
+                host_limits[host] = asyncio.Semaphore(self.per_host)
+            return host_limits[host]
+
+        async def feed(pending: asyncio.Queue, slot: asyncio.Semaphore):
+            # The host's slot is taken before the entry reaches a worker, so a busy host
+            # can't hold workers that other hosts could use
+            while (item := await pending.get()) is not _DONE:
+                await slot.acquire()
+                await queue.put((*item, slot))
+
+        async def dispatch(i: int, d: dict, offset: float):
+            slot = host_limit(d)
+            if not slot:
+                return await queue.put((i, d, offset, None))
+
+            if slot not in host_queues:
+                host_queues[slot] = asyncio.Queue(maxsize=self.queue_size)
+                feeders.append(asyncio.create_task(feed(host_queues[slot], slot)))
+            await host_queues[slot].put((i, d, offset))
+
+        async def produce():
+            try:
+                for i, d in enumerate(data):
+                    offset = d.get("delay", 0)
+                    not window or await window.acquire()
+                    await wait(offset)
+                    await dispatch(i, d, offset)
+                for pending in host_queues.values():
+                    await pending.put(_DONE)
+                await asyncio.gather(*feeders)
+            finally:
+                for task in feeders:
+                    task.cancel()
+                await asyncio.gather(*feeders, return_exceptions=True)
+            for _ in range(workers):
+                await queue.put(_DONE)
+
+        async def arrive(i: int, d: dict, offset: float):
+            slot = host_limit(d)
+            not slot or await slot.acquire()
+            try:
+                async with in_flight:
+                    result = await handle(d, offset)
+            finally:
+                not slot or slot.release()
+            await results.put((i, result))
+
+        async def release():
+            # Open loop, so each arrival is released on time whether or not workers are free
+            arrivals, errors = set(), []
+
+            def done(task: asyncio.Task):
+                arrivals.discard(task)
+                task.cancelled() or not task.exception() or errors.append(
+                    task.exception()
+                )
+
+            try:
+                for i, d in enumerate(data):
+                    not window or await window.acquire()
+                    await wait(i / self.rate)
+                    if errors:
+                        raise errors[0]
+                    task = asyncio.create_task(arrive(i, d, i / self.rate))
+                    task.add_done_callback(done)
+                    arrivals.add(task)
+                await asyncio.gather(*arrivals)
+            finally:
+                for task in list(arrivals):
+                    task.cancel()
+                await asyncio.gather(*arrivals, return_exceptions=True)
+
+        async def send(d: dict, offset: float) -> Any:
+            if self.rate:
+                d["scheduled_seconds"] = offset
+                d["send_lag_seconds"] = loop.time() - start - offset
+            return await worker(d)
+
+        async def handle(d: dict, offset: float) -> Any:
+            if not limit:
+                return await send(d, offset)
+
+            await limit.acquire()
+            sent = loop.time()
+            try:
+                result = await send(d, offset)
+            except BaseException:
+                limit.release(loop.time() - sent, True)
+                raise
+            limit.release(loop.time() - sent, limit.throttled(result))
+            return result
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    return
+
+                i, d, offset, slot = item
+                try:
+                    result = await handle(d, offset)
+                finally:
+                    not slot or slot.release()
+                await results.put((i, result))
+
+        async def run():
+            if self.rate:
+                tasks = [asyncio.create_task(release())]
+            else:
+                tasks = [asyncio.create_task(produce())]
+                tasks += [asyncio.create_task(consume()) for _ in range(workers)]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                # The batch failed or was abandoned, so its unread results make way for _DONE
+                while results.full():
+                    results.get_nowait()
+                results.put_nowait(_DONE)
+                raise
+            await results.put(_DONE)
+
+        runner = asyncio.create_task(run())
+        try:
+            buffer = {}
+            position = 0
+            while True:
+                item = await results.get()
+                if item is _DONE:
+                    break
+
+                if not ordered:
+                    yield item[1]
+                    continue
+
+                buffer[item[0]] = item[1]
+                while position in buffer:
+                    yield buffer.pop(position)
+                    position += 1
+                    window.release()
+            await runner
+        finally:
+            runner.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await runner
@@ -0,0 +1,209 @@
+import multiprocessing
+import os
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import Any
+
+import apiautomationtools.reporting.response_csv as rc
+from apiautomationtools.client.async_requests import AsyncRequests
+from apiautomationtools.client.history import BatchHistory
+from apiautomationtools.logging import Logger
+from apiautomationtools.reporting.histogram import BatchStats
+
+_client = None
+
+
+def _init_worker(client: type, counter: Any, client_configs: dict):
+    """
+    This builds a worker process's client, which keeps its event loop and connection pool
+    for the life of the process. Each worker logs to its own numbered log file.
+
+    Args:
+        client: The client class eg AsyncRequests or HttpxRequests.
+        counter: The shared count of started workers.
+        client_configs: The configs of the client eg {'root_dir': ..., 'reuse': True}.
+    """
+    global _client
+    with counter.get_lock():
+        counter.value += 1
+        Logger.suffix = f"_shard_{counter.value}"
+    _client = client(**client_configs)
+
+
+def _file_name(value: Any) -> Any:
+    """
+    This swaps an upload file for its name, inside any (filename, file, ...) tuple.
+
+    Args:
+        value: The upload eg a MappedFile or a ('name', file, 'text/plain') tuple.
+
+    Returns:
+        value: The upload with its file swapped for the file's name.
+    """
+    if isinstance(value, tuple):
+        return tuple(_file_name(v) for v in value)
+    return getattr(value, "name", value)
+
+
+def _portable(record: dict) -> dict:
+    """
+    This makes a record picklable so it can be sent back from a worker process.
+
+    Args:
+        record: The response record eg {'description': ..., 'actual_code': ..., ...}.
+
+    Returns:
+        record: The picklable response record.
+    """
+    body = record["kwargs"].get("data")
+    if "FormData" in str(type(body)):
+        # The fields become the parts of a multipart writer once the form is sent
+        record["kwargs"]["data"] = [
+            (options, headers, _file_name(value))
+            for options, headers, value in body._fields
+        ] + [
+            ({}, dict(part.headers), _file_name(part._value))
+            for part, *_ in body._writer._parts
+        ]
+
+    files = record["kwargs"].get("files")
+    if isinstance(files, dict):
+        record["kwargs"]["files"] = {k: _file_name(v) for k, v in files.items()}
+    elif files:
+        record["kwargs"]["files"] = [(k, _file_name(v)) for k, v in files]
+    return record
+
+
+def _run_shard(data: list[dict], delay: int | float, kwargs: dict) -> tuple:
+    """
+    This runs a shard of a batch on the worker process's client.
+
+    Args:
+        data: The shard of info needed to make the request eg [{'url': ..., 'method': 'get'}].
+        delay: How long to delay between requests.
+        kwargs: The additional params eg headers or data etc.
+
+    Returns:
+        shard: The response records and the shard's batch stats.
+    """
+    _client.batch_number += 1
+    data, kwargs = _client.build_request_info(data, delay, **kwargs)
+
+    stats = BatchStats()
+    responses = _client.runner.run(_client.each_request(data, stats, **kwargs))
+    return [_portable(r) for r in responses], stats
+
+
+class ShardedRequests(object):
+    """
+    Code minifier for batching requests across worker processes.
+    """
+
+    def __init__(
+        self,
+        root_dir: None | str = None,
+        client: type = AsyncRequests,
+        processes: None | int = None,
+        history_batches: None | int = None,
+        history_bytes: None | int = None,
+        **client_configs,
+    ):
+        """
+        This is the constructor for ShardedRequests.
+
+        Args:
+            root_dir: A specified root directory.
+            client: The client each worker process runs eg AsyncRequests or HttpxRequests.
+            processes: The number of worker processes (defaults to the cpu count).
+            history_batches: The most batch results to keep in memory. Every batch is then
+                             written to the client's own _history_<id>.jsonl file next to the
+                             report, which older batches are read back from.
+            history_bytes: The most bytes of batch results, as written to the history
+                           file, to keep in memory.
+            client_configs: The configs of each worker's client eg reuse or max_in_flight. A
+                            rate is split evenly across the workers.
+        """
+        Logger().get_logger(root_dir=root_dir)
+        self.logging = Logger()
+        self.logger = self.logging.logger
+        self.csv_path = self.logging.log_file_path.replace(".log", ".csv")
+
+        self.processes = processes or os.cpu_count()
+        if client_configs.get("rate"):
+            client_configs["rate"] /= self.processes
+        client_configs = {"root_dir": root_dir, **client_configs}
+
+        context = multiprocessing.get_context("spawn")
+        counter = context.Value("i", 0)
+        self.executor = ProcessPoolExecutor(
+            self.processes, context, _init_worker, (client, counter, client_configs)
+        )
+        weakref.finalize(self, self.executor.shutdown)
+        self.batch_number = 0
+        self._return_history = BatchHistory(
+            history_batches,
+            history_bytes,
+            self.csv_path.replace(".csv", "_history.jsonl"),
+        )
+
+    def shutdown(self):
+        """
+        This will stop the worker processes.
+        """
+        self.executor.shutdown()
+
+    def request(
+        self,
+        data: list[dict] | dict,
+        delay: int | float = 0,
+        report: bool = True,
+        **kwargs: Any,
+    ) -> dict:
+        """
+        The batch executor for the requests batch. The batch is split round robin across the
+        workers, so the delay between requests is kept within each worker.
+
+        Args:
+            data: The list of info needed to make the request eg [{'url': ..., 'method': 'get'}].
+            delay: How long to delay between requests.
+            report: Whether to create or update a report with the current responses.
+            **kwargs: The additional params eg headers or data etc.
+        Returns:
+            responses: The global response object eg {'duration': ..., 'responses': ..., 'stats': ...}.
+        """
+        self.batch_number += 1
+        if type(data) is not list:
+            data = [data]
+
+        t0 = time.perf_counter()
+        futures = [
+            self.executor.submit(
+                _run_shard, data[k :: self.processes], delay * self.processes, kwargs
+            )
+            for k in range(min(self.processes, len(data)))
+        ]
+
+        stats = BatchStats()
+        responses = []
+        for k, future in enumerate(futures):
+            records, shard_stats = future.result()
+            stats.merge(shard_stats)
+            for r in records:
+                r["index"] = (r["index"] - 1) * self.processes + k + 1
+                r["batch_number"] = self.batch_number
+            responses += records
+        t1 = time.perf_counter()
+
+        _return = {
+            "duration": round(t1 - t0, 2),
+            "responses": sorted(responses, key=itemgetter("index")),
+            "stats": stats.summary(t1 - t0),
+        }
+        self._return_history.append(_return)
+        self.logger.info("The batch duration was %s seconds.", _return["duration"])
+
+        if _return["responses"]:
+            not report or rc.create_csv_report(self.csv_path, _return, scrub=True)
+        return _return
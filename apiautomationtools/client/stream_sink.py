@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable
+
+# The writer threads shared by every sink, so concurrent downloads don't each start a thread
+WRITERS = ThreadPoolExecutor(
+    max_workers=min(8, (os.cpu_count() or 1) + 4), thread_name_prefix="stream-sink"
+)
+
+
+def split_ranges(headers: dict, ranges: int, min_size: int) -> list[tuple[int, int]]:
+    """
+    This splits a download into byte ranges, if the server accepts ranges and it's big enough.
+
+    Args:
+        headers: The response headers.
+        ranges: The number of ranges to split it into.
+        min_size: The smallest download to split.
+
+    Returns:
+        parts: The start and end of each range eg [(0, 100), (100, 200)], or [] if it can't be
+               split.
+    """
+    headers = {k.lower(): v for k, v in headers.items()}
+    if headers.get("accept-ranges") != "bytes":
+        return []
+    if headers.get("content-encoding", "identity") != "identity":
+        return []
+
+    size = int(headers.get("content-length") or 0)
+    if ranges < 2 or size < max(min_size, ranges):
+        return []
+    step = -(-size // ranges)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+class StreamSink(object):
+    """
+    Writes a streamed response body to a file on a shared pool of writer threads, hashing it on
+    the way. Each sink's chunks are written in order by one thread at a time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        digest: None | str = "sha256",
+        size: None | int = None,
+        max_chunks: int = 8,
+    ):
+        """
+        This is the constructor for StreamSink.
+
+        Args:
+            path: The path to write the body to.
+            digest: The hashlib algorithm of the body's digest eg sha256 or md5.
+            size: The size to preallocate the file to for writing ranges at their offsets.
+            max_chunks: The most chunks waiting to be written before write() waits.
+        """
+        self.path = path
+        self.hash = hashlib.new(digest) if digest else None
+        self.total = size
+        self.size = 0
+        self.seconds = None
+        self.chunks = deque()
+        self.slots = asyncio.Semaphore(max_chunks)
+        self.lock = threading.Lock()
+        self.draining = False
+        self.error = None
+        self.done = Future()
+        self._fd = None
+        self._loop = None
+        self._t0 = None
+
+    def _open(self):
+        """
+        This opens the file, preallocating it for ranges.
+        """
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            not self.total or os.ftruncate(self._fd, self.total)
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _drain(self):
+        """
+        This writes and hashes the queued chunks until there are none left, closing the file
+        at the end of the body.
+        """
+        while True:
+            with self.lock:
+                if not self.chunks:
+                    self.draining = False
+                    return
+                item = self.chunks.popleft()
+
+            if item is None:
+                os.close(self._fd)
+                self.error or self.done.set_result(None)
+                continue
+            if self.error:
+                continue
+
+            offset, chunk = item
+            try:
+                view = memoryview(chunk)
+                while view:
+                    written = os.pwrite(self._fd, view, offset)
+                    view, offset = view[written:], offset + written
+                not self.hash or self.hash.update(chunk)
+            except Exception as e:
+                self.error = e
+                self.done.set_exception(e)
+            self._loop.call_soon_threadsafe(self.slots.release)
+
+    def _queue(self, item: None | tuple[int, bytes]):
+        """
+        This queues a chunk, or None for the end of the body, and has a writer drain the queue
+        if none is already.
+
+        Args:
+            item: The offset and chunk to write.
+        """
+        with self.lock:
+            self.chunks.append(item)
+            start, self.draining = not self.draining, True
+        not start or WRITERS.submit(self._drain)
+
+    async def __aenter__(self) -> "StreamSink":
+        self._loop = asyncio.get_running_loop()
+        await self._loop.run_in_executor(WRITERS, self._open)
+        self._t0 = time.perf_counter()
+        return self
+
+    async def __aexit__(self, *args):
+        self._queue(None)
+        await asyncio.wrap_future(self.done)
+        self.seconds = time.perf_counter() - self._t0
+
+    async def write(self, chunk: bytes, offset: None | int = None):
+        """
+        This queues a chunk to be written, waiting while the writer is behind.
+
+        Args:
+            chunk: The chunk of the body.
+            offset: Where to write the chunk (defaults to after the last chunk).
+        """
+        if self.done.done():
+            self.done.result()
+        await self.slots.acquire()
+        self._queue((self.size if offset is None else offset, chunk))
+        self.size += len(chunk)
+
+    async def write_range(self, chunks: AsyncIterator[bytes], start: int, end: int):
+        """
+        This writes a byte range of the body at its offset.
+
+        Args:
+            chunks: The chunks of the range, which may run past its end.
+            start: The offset of the range.
+            end: The end of the range.
+        """
+        offset = start
+        async for chunk in chunks:
+            chunk = chunk[: end - offset]
+            await self.write(chunk, offset)
+            offset += len(chunk)
+            if offset >= end:
+                break
+
+        if offset != end:
+            raise ValueError(f"The range {start}-{end - 1} of {self.path} ended early.")
+
+    async def write_ranges(
+        self,
+        parts: list[tuple[int, int]],
+        chunks: None | AsyncIterator[bytes],
+        read_range: Callable[[int, int], Awaitable],
+    ):
+        """
+        This writes the first range from an open response and reads the others in parallel.
+
+        Args:
+            parts: The start and end of each range eg [(0, 100), (100, 200)].
+            chunks: The chunks of the open response, or None to read the first range too.
+            read_range: Requests a range and writes it with write_range().
+        """
+        first = self.write_range(chunks, *parts[0]) if chunks else read_range(*parts[0])
+        tasks = [asyncio.ensure_future(first)]
+        tasks += [asyncio.ensure_future(read_range(*part)) for part in parts[1:]]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def summary(self) -> dict:
+        """
+        This summarizes the written body. Ranged downloads aren't hashed as they arrive out of
+        order.
+
+        Returns:
+            summary: The body's size, digest and write speed eg {'stream_bytes': ..., ...}.
+        """
+        digest = self.hash and f"{self.hash.name}:{self.hash.hexdigest()}"
+        return {
+            "stream_bytes": self.size,
+            "stream_digest": digest,
+            "stream_mbps": self.size / 1e6 / self.seconds if self.seconds else None,
+        }
@@ -0,0 +1,107 @@
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import TraceConfig
+
+PHASES = {
+    "queue": ["queue_start", "queue_end"],
+    "dns": ["dns_start", "dns_end"],
+    "connect": ["connect_start", "connect_end"],
+    "tls": ["tls_start", "tls_end"],
+    "ttfb": ["request_sent", "headers_received"],
+    "body": ["headers_received", "body_end"],
+    "total": ["start", "body_end"],
+}
+
+HTTPX_EVENTS = {
+    "connect_tcp.started": "connect_start",
+    "connect_tcp.complete": "connect_end",
+    "start_tls.started": "tls_start",
+    "start_tls.complete": "tls_end",
+    "send_request_headers.started": "request_start",
+    "send_request_body.complete": "request_sent",
+    "receive_response_headers.complete": "headers_received",
+    "receive_response_body.complete": "body_end",
+}
+
+
+class PhaseTimer(object):
+    """
+    Collects the timestamps of a request's phases from the client's tracing hooks.
+    """
+
+    def __init__(self):
+        """
+        This is the constructor for PhaseTimer.
+        """
+        self.marks = {}
+
+    def mark(self, name: str, overwrite: bool = False):
+        """
+        This marks the time a phase boundary was reached.
+
+        Args:
+            name: The name of the phase boundary eg dns_start.
+            overwrite: Whether to replace an existing mark of the same name.
+        """
+        if overwrite or name not in self.marks:
+            self.marks[name] = time.perf_counter_ns()
+
+    def phases(self) -> dict:
+        """
+        This gets the duration of each phase. Phases that didn't happen, eg dns or connect on
+        a reused connection, are None.
+
+        Returns:
+            phases: The phase durations in seconds eg {'queue': ..., 'dns': ..., ...}.
+        """
+        phases = {}
+        for phase, (start, end) in PHASES.items():
+            t0, t1 = self.marks.get(start), self.marks.get(end)
+            phases[phase] = None if t0 is None or t1 is None else (t1 - t0) / 1e9
+        return phases
+
+    async def httpx_trace(self, event: str, info: dict):
+        """
+        This is the httpx trace extension callback. DNS is part of connect, and queue ends
+        when a new connection starts or a pooled one starts sending the request.
+
+        Args:
+            event: The httpcore event eg http11.send_request_headers.started.
+            info: The event info.
+        """
+        name = HTTPX_EVENTS.get(event.split(".", 1)[-1])
+        if name in ["connect_start", "request_start"]:
+            self.marks.setdefault("queue_start", self.marks.get("start"))
+            self.mark("queue_end")
+        not name or self.mark(name)
+
+
+def aiohttp_trace_config() -> TraceConfig:
+    """
+    This builds the aiohttp trace config that feeds the PhaseTimer passed as a request's
+    trace_request_ctx. TLS is part of connect as aiohttp doesn't trace it separately.
+
+    Returns:
+        trace_config: The trace config for a ClientSession.
+    """
+    trace_config = TraceConfig()
+
+    def hook(name: str, overwrite: bool = False) -> Any:
+        async def on_event(session: Any, ctx: SimpleNamespace, params: Any):
+            timer = ctx.trace_request_ctx
+            not isinstance(timer, PhaseTimer) or timer.mark(name, overwrite)
+
+        return on_event
+
+    trace_config.on_connection_queued_start.append(hook("queue_start"))
+    trace_config.on_connection_queued_end.append(hook("queue_end"))
+    trace_config.on_dns_resolvehost_start.append(hook("dns_start"))
+    trace_config.on_dns_resolvehost_end.append(hook("dns_end"))
+    trace_config.on_connection_create_start.append(hook("connect_start"))
+    trace_config.on_connection_create_end.append(hook("connect_end"))
+    trace_config.on_request_headers_sent.append(hook("request_sent"))
+    trace_config.on_request_chunk_sent.append(hook("request_sent", True))
+    trace_config.on_request_end.append(hook("headers_received"))
+    return trace_config
@@ -1,15 +1,89 @@
+import atexit
+import itertools
 import logging
 import os
+import queue
 import re
+import sys
+from collections import defaultdict
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from shutil import rmtree
 from typing import Any
 
-import __main__ as main
-
 import apiautomationtools.helpers.directory_helpers as dh
 
 
+class SampleFilter(logging.Filter):
+    """
+    Keeps one in every n records below a level, and every record at or above it. Each logging
+    call is counted on its own, so paired messages eg making and made a request are kept as
+    evenly as each other.
+    """
+
+    def __init__(self, every: int = 1, level: int = logging.WARNING):
+        """
+        This is the constructor for SampleFilter.
+
+        Args:
+            every: Keep one in this many records below the level.
+            level: The level from which every record is kept.
+        """
+        super().__init__()
+        self.every = every
+        self.level = level
+        self.counts = defaultdict(itertools.count)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every <= 1 or record.levelno >= self.level:
+            return True
+        return next(self.counts[record.pathname, record.lineno]) % self.every == 0
+
+
+class BackgroundHandler(QueueHandler):
+    """
+    Queues records for a QueueListener to format and write on its own thread. The message is
+    merged with its args on the caller's thread though, so the args' reprs are built there. The
+    queue may be bounded, in which case records below the flush level are dropped while it's
+    full and the rest wait for room. Records at or above the flush level also wait until
+    everything queued has been written.
+    """
+
+    def __init__(self, records: queue.Queue, flush_level: int = logging.WARNING):
+        """
+        This is the constructor for BackgroundHandler.
+
+        Args:
+            records: The queue the listener writes records from.
+            flush_level: The level from which records wait to be written.
+        """
+        super().__init__(records)
+        self.flush_level = flush_level
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The args may change or be freed before the listener gets to them, so the message is
+        # merged with them here on the caller, eg the event loop, along with building their
+        # reprs. Only the rest of the formatting and the writing are left to the listener
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if record.levelno >= self.flush_level:
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record: logging.LogRecord):
+        super().emit(record)
+        record.levelno < self.flush_level or self.queue.join()
+
+
 class Logger(object):
     """
     This is a wrapper around the logging module.
@@ -20,6 +94,11 @@ class Logger(object):
     log_dir: None | str = None
     log_file_path: None | str = None
     run_info_path: None | str = None
+    suffix: str = ""
+    level: int = logging.INFO
+    sample: int = 1
+    queue_size: int = 10000
+    listener: None | QueueListener = None
 
     @classmethod
     def get_logger(cls, root_dir: None | str = None, by_time: bool = False) -> Any:
@@ -58,6 +137,8 @@ class Logger(object):
         Returns:
             log_file_path: The path of the log file to write to.
         """
+        # Looked up when it's needed, as spawned processes swap __main__ after their imports
+        main = sys.modules["__main__"]
         calling_test = (
             os.environ.get("PYTEST_CURRENT_TEST")
             or getattr(main, "__file__", None)
@@ -89,7 +170,7 @@ class Logger(object):
         dh.safe_mkdirs(log_dir_path_pass)
         dh.safe_mkdirs(log_dir_path_fail)
 
-        filename = re.sub(r"test_|.py", "", file_path.split("/")[-1])
+        filename = re.sub(r"test_|.py", "", file_path.split("/")[-1]) + cls.suffix
         if by_time:
             filename += f"_{datetime.now().strftime('%Y-%m-%d_%H:%M:%S')}"
 
@@ -98,7 +179,10 @@ class Logger(object):
     @classmethod
     def set_logger_handler(cls, **kwargs: Any):
         """
-        This (re)sets the logging handler.
+        This (re)sets the logging handler. Records are formatted and written by a background
+        QueueListener, and only one in every Logger.sample records below WARNING is kept. The
+        queue holds up to Logger.queue_size records (0 is unbounded), past which records below
+        WARNING are dropped and the rest wait for room.
 
         Args:
             kwargs: See the logging basicConfig function for more param details.
@@ -107,17 +191,37 @@ class Logger(object):
             logging: The updated logging module.
         """
         stock_kwargs = {
-            "level": logging.INFO,
+            "level": cls.level,
             "filemode": "w",
             "filename": "stock_log_file.log",
             "format": "%(asctime)s | %(levelname)s |  %(name)s | %(message)s",
         }
         stock_kwargs.update(kwargs)
 
+        cls.stop_listener()
         cls.logger.root.handlers = []
         cls.logger._handlerList = []
         cls.logger.basicConfig(**stock_kwargs)
 
+        handler = BackgroundHandler(queue.Queue(cls.queue_size))
+        handler.addFilter(SampleFilter(cls.sample))
+        cls.listener = QueueListener(
+            handler.queue, *cls.logger.root.handlers, respect_handler_level=True
+        )
+        cls.logger.root.handlers = [handler]
+        cls.listener.start()
+
+    @classmethod
+    def stop_listener(cls):
+        """
+        This writes out any queued records and stops the background writer, after which records
+        are written directly again.
+        """
+        listener, cls.listener = cls.listener, None
+        if listener:
+            cls.logger.root.handlers = list(listener.handlers)
+            listener.stop()
+
     @classmethod
     def delete_run_info(cls, path: None | str = None):
         """
@@ -128,3 +232,6 @@ class Logger(object):
         """
         path = path or cls.run_info_path
         rmtree(path)
+
+
+atexit.register(Logger.stop_listener)
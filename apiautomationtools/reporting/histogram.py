@@ -0,0 +1,256 @@
+from typing import Any
+
+PERCENTILES = [50, 90, 99, 99.9]
+
+
+class LatencyHistogram(object):
+    """
+    A log-bucketed (HDR style) latency histogram with a relative error below 1%.
+    """
+
+    sub_bucket_bits = 8
+
+    def __init__(self):
+        """
+        This is the constructor for LatencyHistogram.
+        """
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _bucket(self, value: int) -> int:
+        """
+        This gets the bucket of a value. Buckets are ordered like the values they hold.
+
+        Args:
+            value: The value in nanoseconds.
+
+        Returns:
+            bucket: The bucket key.
+        """
+        exponent = max(0, value.bit_length() - self.sub_bucket_bits)
+        return (exponent << self.sub_bucket_bits) + (value >> exponent)
+
+    def _bucket_value(self, bucket: int) -> int:
+        """
+        This gets the value a bucket represents, which is the middle of its range.
+
+        Args:
+            bucket: The bucket key.
+
+        Returns:
+            value: The value in nanoseconds.
+        """
+        exponent = bucket >> self.sub_bucket_bits
+        mantissa = bucket - (exponent << self.sub_bucket_bits)
+        return (mantissa << exponent) + ((1 << exponent) >> 1)
+
+    def record(self, value: int):
+        """
+        This records a value.
+
+        Args:
+            value: The value in nanoseconds.
+        """
+        value = max(0, int(value))
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        This adds the values of another histogram to this one.
+
+        Args:
+            other: The histogram to merge in.
+        """
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in [other.min, other.max]:
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentiles(self, percentiles: None | list[float] = None) -> dict:
+        """
+        This gets the values at the given percentiles.
+
+        Args:
+            percentiles: The percentiles to get eg [50, 99].
+
+        Returns:
+            values: The values in nanoseconds eg {50: ..., 99: ...}.
+        """
+        percentiles = sorted(percentiles or PERCENTILES)
+        if not self.count:
+            return {p: None for p in percentiles}
+
+        values = {}
+        seen = 0
+        buckets = iter(sorted(self.counts.items()))
+        for p in percentiles:
+            rank = max(1, -(-self.count * p // 100))
+            while seen < rank:
+                bucket, count = next(buckets)
+                seen += count
+            value = self._bucket_value(bucket)
+            values[p] = min(max(value, self.min), self.max)
+        return values
+
+    def summary(self) -> dict:
+        """
+        This summarizes the histogram in seconds.
+
+        Returns:
+            summary: The summary eg {'count': ..., 'min': ..., 'p50': ..., 'max': ...}.
+        """
+        summary = {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.total // self.count if self.count else None,
+            **{f"p{p:g}": v for p, v in self.percentiles().items()},
+            "max": self.max,
+        }
+        return {
+            k: v if k == "count" or v is None else v / 1e9 for k, v in summary.items()
+        }
+
+
+class BatchStats(object):
+    """
+    Latency histograms and counters for a batch, kept per batch and per description/code group.
+    """
+
+    def __init__(self):
+        """
+        This is the constructor for BatchStats.
+        """
+        self.latency = LatencyHistogram()
+        self.mismatches = 0
+        self.errors = 0
+        self.groups = {}
+        self.connections = {}
+        self.warm = None
+        self.timeouts = None
+        self.limits = []
+
+    def record(self, record: dict, latency: int, connection: None | Any = None):
+        """
+        This records a response record as it's made.
+
+        Args:
+            record: The response record eg {'description': ..., 'actual_code': ..., ...}.
+            latency: The response time in nanoseconds.
+            connection: The key of the connection the response came over, to count the
+                        streams (requests) per connection.
+        """
+        if connection is not None:
+            self.connections[connection] = self.connections.get(connection, 0) + 1
+        if "warm" in record:
+            self.warm = (self.warm or 0) + bool(record["warm"])
+        if "timed_out" in record:
+            self.timeouts = (self.timeouts or 0) + bool(record["timed_out"])
+
+        key = (record.get("description"), record.get("expected_code"))
+        if key not in self.groups:
+            self.groups[key] = BatchStats()
+
+        for stats in [self, self.groups[key]]:
+            stats.latency.record(latency)
+            stats.mismatches += record.get("code_mismatch") == "X"
+            stats.errors += str(record.get("actual_code", ""))[:1] == "5"
+
+    def merge(self, other: "BatchStats"):
+        """
+        This adds the counts of another batch's stats to these ones.
+
+        Args:
+            other: The stats to merge in.
+        """
+        self.latency.merge(other.latency)
+        self.mismatches += other.mismatches
+        self.errors += other.errors
+        for key, count in other.connections.items():
+            self.connections[key] = self.connections.get(key, 0) + count
+        if other.warm is not None:
+            self.warm = (self.warm or 0) + other.warm
+        if other.timeouts is not None:
+            self.timeouts = (self.timeouts or 0) + other.timeouts
+        self.limits += other.limits
+        for key, group in other.groups.items():
+            if key not in self.groups:
+                self.groups[key] = BatchStats()
+            self.groups[key].merge(group)
+
+    def _summary(self, duration: float) -> dict:
+        count = self.latency.count
+        return {
+            "count": count,
+            "throughput": count / duration if duration else None,
+            "mismatch_rate": self.mismatches / count if count else 0,
+            "error_rate": self.errors / count if count else 0,
+            "latency": self.latency.summary(),
+        }
+
+    def _concurrency(self) -> dict:
+        # Each limit's points are summed into one step function, so shards add up
+        current = [None] * len(self.limits)
+        history = []
+        points = ((t, i, n) for i, h in enumerate(self.limits) for t, n in h)
+        for t, i, n in sorted(points):
+            current[i] = n
+            if None not in current:
+                history.append((t, sum(current)))
+        limits = [n for _, n in history]
+        return {
+            "limit": limits[-1] if limits else None,
+            "min": min(limits, default=None),
+            "max": max(limits, default=None),
+            "history": history,
+        }
+
+    def summary(self, duration: float) -> dict[str, Any]:
+        """
+        This summarizes the batch.
+
+        Args:
+            duration: The batch duration in seconds.
+
+        Returns:
+            summary: The summary eg {'count': ..., 'throughput': ..., 'latency': ..., 'groups': ...},
+                     with the streams per connection when connections were recorded and
+                     the requests sent over pre-warmed connections or cut off by a timeout
+                     when records say so and the adaptive concurrency limit over time when
+                     there was one.
+        """
+        groups = [
+            {"description": key[0], "expected_code": key[1], **g._summary(duration)}
+            for key, g in self.groups.items()
+        ]
+        summary = {**self._summary(duration), "groups": groups}
+        if self.connections:
+            streams = self.connections.values()
+            summary["connections"] = {
+                "count": len(self.connections),
+                "streams_per_connection": sum(streams) / len(self.connections),
+                "max_streams_per_connection": max(streams),
+            }
+        if self.warm is not None:
+            count = self.latency.count
+            summary["warm"] = {"count": self.warm, "rate": self.warm / count}
+        if self.timeouts is not None:
+            count = self.latency.count
+            summary["timeouts"] = {
+                "count": self.timeouts,
+                "rate": self.timeouts / count,
+            }
+        if self.limits:
+            summary["concurrency"] = self._concurrency()
+        return summary
@@ -23,7 +23,7 @@ def read_csv(csv_path: None | str) -> list[list]:
     return [
         [
             ast.literal_eval(i)
-            if not (re.findall(r"MultiDict", i) or re.findall(r"BufferedReader", i))
+            if not re.findall(r"MultiDict|BufferedReader|MappedFile", i)
             and re.findall(r"[\[{]", i)
             else i
             for i in d
@@ -143,12 +143,12 @@ def create_csv_report(csv_path: str, _return: dict, scrub: bool = False):
         _return: The _return from a batch request.
         scrub: Whether to remove sensitive info from the data.
     """
-    responses = _return["responses"]
+    responses = [dict(r) for r in _return["responses"]]
 
     for r in responses:
         r["server_headers"] = {k: v for k, v in r["server_headers"].items()}
 
-        kwargs = r.get("kwargs", {})
+        kwargs = dict(r.get("kwargs", {}))
         r["body"] = kwargs.pop("json", {}) or kwargs.pop("data", {})
         if "FormData" in str(type(r["body"])):
             r["body"] = r["body"]._fields
@@ -156,9 +156,11 @@ def create_csv_report(csv_path: str, _return: dict, scrub: bool = False):
             update = {
                 k: v.name
                 for k, v in r["body"].items()
-                if "BufferedReader" in str(type(v))
+                if re.findall(r"BufferedReader|MappedFile", str(type(v)))
             }
-            r["body"].update(update)
+            r["body"] = {**r["body"], **update}
+        if "kwargs" in r:
+            r["kwargs"] = kwargs
 
         r["response_seconds"] = r.pop("response_seconds")
         r["delay_seconds"] = r.pop("delay_seconds")
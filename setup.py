@@ -10,7 +10,6 @@ requires = [
     "pytest",
     "pytest-xdist",
     "aiohttp",
-    "pypeln",
     "numpy",
     "orjson",
     "httpx",
@@ -35,4 +34,5 @@ setup(
     packages=find_packages(),
     python_requires=">=3.10",
     install_requires=requires,
+    extras_require={"http2": ["httpx[http2]"], "uvloop": ["uvloop"]},
 )
@@ -0,0 +1,115 @@
+"""
+Compares the requests per second and cpu per request of each event loop, for both clients,
+against a stand-in server in its own process.
+
+    python -m tests.benchmarks.loops --requests 5000 --json loops.json
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import time
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.loop_runner import LOOPS
+from apiautomationtools.logging import Logger
+from tests.benchmarks.stand_in_server import StandInServer
+
+CLIENTS = {"aiohttp": AsyncRequests, "httpx": HttpxRequests}
+
+
+def available_loops() -> list[str]:
+    """
+    This gets the loops that are installed.
+
+    Returns:
+        loops: The names of the installed loops eg ['asyncio', 'uvloop'].
+    """
+    return [name for name, module in LOOPS.items() if importlib.util.find_spec(module)]
+
+
+def bench_loop(
+    client: str, loop: str, url: str, requests: int, max_in_flight: int
+) -> dict:
+    """
+    This runs the same batch on a client with the given loop.
+
+    Args:
+        client: The client eg aiohttp or httpx.
+        loop: The loop eg asyncio or uvloop.
+        url: The url to request.
+        requests: The number of requests in the batch.
+        max_in_flight: The maximum number of requests in flight at once.
+
+    Returns:
+        result: The batch's requests per second and cpu per request eg {'rps': ..., ...}.
+    """
+    requests_client = CLIENTS[client](
+        reuse=True, max_in_flight=max_in_flight, loop=loop
+    )
+    batch = [{"method": "get", "headers": {}, "url": url}] * requests
+    requests_client.request(batch[:max_in_flight], report=False)
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    requests_client.request(batch, report=False)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    requests_client.shutdown()
+
+    return {
+        "client": client,
+        "loop": loop,
+        "requests": requests,
+        "seconds": round(wall, 3),
+        "rps": round(requests / wall, 1),
+        "cpu_ms_per_request": round(cpu * 1e3 / requests, 4),
+    }
+
+
+def main(args: None | list[str] = None) -> list[dict]:
+    """
+    This benchmarks every installed loop with both clients and prints the results.
+
+    Args:
+        args: The command line arguments.
+
+    Returns:
+        results: The result of each client and loop.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--max-in-flight", type=int, default=100)
+    parser.add_argument("--clients", nargs="+", default=list(CLIENTS))
+    parser.add_argument("--loops", nargs="+", default=available_loops())
+    parser.add_argument("--json", help="The path to write the results to.")
+    args = parser.parse_args(args)
+
+    # Request logging would dominate the loop's own overhead
+    level, Logger.level = Logger.level, logging.WARNING
+    server = StandInServer().start()
+    try:
+        results = [
+            bench_loop(
+                client, loop, f"{server.url}/get", args.requests, args.max_in_flight
+            )
+            for client in args.clients
+            for loop in args.loops
+        ]
+    finally:
+        server.stop()
+        Logger.level = level
+        Logger.run_info_path and Logger.delete_run_info()
+
+    for r in results:
+        print(
+            f"{r['client']:>8} {r['loop']:>8} {r['rps']:>10} req/s "
+            f"{r['cpu_ms_per_request']:>8} cpu ms/req"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Measures the memory each response record keeps, for both clients and their body and payload
+settings, against the same records held as plain dicts.
+
+    python -m tests.benchmarks.record_memory --batch-size 2000
+"""
+
+import argparse
+import logging
+import sys
+from collections.abc import Mapping
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.record import ResponseRecord
+from apiautomationtools.logging import Logger
+from tests.benchmarks.stand_in_server import StandInServer
+
+CLIENTS = {"aiohttp": AsyncRequests, "httpx": HttpxRequests}
+# The client settings measured, by name
+SETTINGS = {
+    "json": {},
+    "no_payloads": {"keep_payloads": False},
+    "raw": {"body": "raw", "keep_payloads": False},
+}
+
+
+def deep_size(values: list) -> int:
+    """
+    This gets the bytes the values hold, counting objects they share only once.
+
+    Args:
+        values: The values eg response records.
+
+    Returns:
+        size: The bytes the values and everything they refer to take up.
+    """
+    seen, size, stack = set(), 0, list(values)
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, ResponseRecord):
+            slots = ResponseRecord.__slots__
+            stack += [getattr(value, k) for k in slots if hasattr(value, k)]
+        elif isinstance(value, Mapping):
+            for item in value.items():
+                stack += item
+        elif isinstance(value, list | tuple | set):
+            stack += value
+    return size
+
+
+def record_sizes(url: str, client: str, batch_size: int, payload: int) -> dict:
+    """
+    This measures the bytes per record of a batch under each of the settings, and of the
+    default records copied into plain dicts.
+
+    Args:
+        url: The base url of the stand-in server.
+        client: The client eg aiohttp or httpx.
+        batch_size: The number of requests.
+        payload: The size of the padding in each response body in bytes.
+
+    Returns:
+        sizes: The bytes per record by setting eg {'dict': ..., 'json': ..., 'raw': ...}.
+    """
+    # Request logging would hold on to the records' reprs
+    Logger.level = logging.WARNING
+    batch = [
+        {
+            "method": "post",
+            "headers": {"Authorization": "Bearer 123"},
+            "url": f"{url}/get?size={payload}&index={i}",
+            "json": {"id": i},
+        }
+        for i in range(batch_size)
+    ]
+
+    sizes = {}
+    for name, settings in SETTINGS.items():
+        requests = CLIENTS[client](**settings)
+        responses = requests.request(batch, report=False)["responses"]
+        sizes[name] = deep_size(responses) / batch_size
+        if name == "json":
+            records = [dict(r.items()) for r in responses]
+            sizes["dict"] = deep_size(records) / batch_size
+        requests.shutdown()
+    return sizes
+
+
+def main(args: None | list[str] = None) -> dict:
+    """
+    This measures and prints the bytes per record of each client.
+
+    Args:
+        args: The command line arguments.
+
+    Returns:
+        sizes: The bytes per record by client and setting eg {'aiohttp': {'raw': ...}}.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", nargs="+", default=list(CLIENTS))
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--payload", type=int, default=256)
+    args = parser.parse_args(args)
+
+    server = StandInServer().start()
+    try:
+        sizes = {
+            client: record_sizes(server.url, client, args.batch_size, args.payload)
+            for client in args.clients
+        }
+    finally:
+        server.stop()
+
+    for client, client_sizes in sizes.items():
+        print(client, *[f"{k} {v:.0f}B" for k, v in client_sizes.items()])
+    return sizes
+
+
+if __name__ == "__main__":
+    main()
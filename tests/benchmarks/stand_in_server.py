@@ -0,0 +1,50 @@
+import multiprocessing
+from multiprocessing.connection import Connection
+
+from tests.client.local_server import LocalServer
+
+
+def _serve(conn: Connection):
+    """
+    This runs a LocalServer until it's told to stop.
+
+    Args:
+        conn: The pipe to send the server's url on and wait for the stop on.
+    """
+    server = LocalServer().start()
+    conn.send(server.url)
+    conn.recv()
+    server.stop()
+
+
+class StandInServer(object):
+    """
+    A LocalServer in its own process, so its cpu time isn't counted against the client.
+    """
+
+    def __init__(self):
+        """
+        This is the constructor for StandInServer.
+        """
+        context = multiprocessing.get_context("spawn")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child,), daemon=True)
+        self.url = None
+
+    def start(self) -> "StandInServer":
+        """
+        This starts the server.
+
+        Returns:
+            server: The started server.
+        """
+        self.process.start()
+        self.url = self.conn.recv()
+        return self
+
+    def stop(self):
+        """
+        This stops the server.
+        """
+        self.conn.send(None)
+        self.process.join()
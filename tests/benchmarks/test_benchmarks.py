@@ -0,0 +1,76 @@
+import pytest
+
+from apiautomationtools.logging import Logger
+from tests.benchmarks.record_memory import record_sizes
+from tests.benchmarks.throughput import compare, run_scenario, stand_in_batch
+
+pytestmark = pytest.mark.client
+
+
+def test_stand_in_batch():
+    batch = stand_in_batch("http://host", 20, 0.01, 64, 0.1)
+    statuses = [r["url"].split("status=")[-1] for r in batch]
+    assert statuses.count("500") == 2
+    assert statuses.index("500") != statuses[::-1].index("500")
+    assert "delay=0.01&size=64" in batch[0]["url"]
+
+
+def test_compare():
+    scenario = {
+        "client": "aiohttp",
+        "batch_size": 100,
+        "concurrency": 10,
+        "latency": 0.0,
+        "payload": 0,
+        "errors": 0.0,
+    }
+    baseline = [{**scenario, "rps": 1000, "cpu_ms_per_request": 1.0}]
+
+    results = [{**scenario, "rps": 950, "cpu_ms_per_request": 1.05}]
+    assert not compare(results, baseline, 0.1)
+
+    results = [{**scenario, "rps": 800, "cpu_ms_per_request": 1.0}]
+    assert compare(results, baseline, 0.1)
+
+    results = [{**scenario, "concurrency": 20, "rps": 1, "cpu_ms_per_request": 9}]
+    assert not compare(results, baseline, 0.1)
+
+
+@pytest.mark.parametrize("client", ["aiohttp", "httpx"])
+def test_run_scenario(server, client):
+    level = Logger.level
+    scenario = {
+        "client": client,
+        "batch_size": 20,
+        "concurrency": 5,
+        "latency": 0.0,
+        "payload": 128,
+        "errors": 0.25,
+    }
+    try:
+        result = run_scenario(scenario, server.url)
+    finally:
+        Logger.level = level
+
+    assert result["rps"] > 0
+    assert result["cpu_ms_per_request"] > 0
+    assert result["peak_rss_mb"] > 0
+    assert result["latency_ms"]["p50"] <= result["latency_ms"]["max"]
+    assert result["error_rate"] == 0.25
+
+    Logger().delete_run_info()
+
+
+@pytest.mark.parametrize("client", ["aiohttp", "httpx"])
+def test_record_sizes(server, client):
+    level = Logger.level
+    try:
+        sizes = record_sizes(server.url, client, 100, 256)
+    finally:
+        Logger.level = level
+
+    assert sizes["json"] < sizes["dict"]
+    assert sizes["no_payloads"] < sizes["json"]
+    assert sizes["raw"] < 0.75 * sizes["dict"]
+
+    Logger().delete_run_info()
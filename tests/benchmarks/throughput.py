@@ -0,0 +1,222 @@
+"""
+Measures the throughput of both clients at several batch sizes and concurrency levels against a
+stand-in server with a set latency, payload size and status mix. Each run is recorded to a json
+results file, which later runs can be compared against to catch regressions.
+
+    python -m tests.benchmarks.throughput --json results.json
+    python -m tests.benchmarks.throughput --compare results.json --tolerance 0.1
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.logging import Logger
+from tests.benchmarks.stand_in_server import StandInServer
+
+CLIENTS = {"aiohttp": AsyncRequests, "httpx": HttpxRequests}
+# The fields that identify a scenario across runs
+SCENARIO_KEYS = ["client", "batch_size", "concurrency", "latency", "payload", "errors"]
+
+
+def stand_in_batch(
+    url: str, batch_size: int, latency: float, payload: int, errors: float
+) -> list[dict]:
+    """
+    This builds a batch for the stand-in server, with the errors spread evenly through it.
+
+    Args:
+        url: The base url of the stand-in server.
+        batch_size: The number of requests.
+        latency: How long the server waits before each response in seconds.
+        payload: The size of the padding in each response body in bytes.
+        errors: The fraction of requests that get a 500 response.
+
+    Returns:
+        batch: The batch eg [{'method': 'get', 'url': ...}, ...].
+    """
+    return [
+        {
+            "method": "get",
+            "headers": {},
+            "url": f"{url}/get?delay={latency}&size={payload}"
+            f"&status={500 if int((i + 1) * errors) > int(i * errors) else 200}",
+        }
+        for i in range(batch_size)
+    ]
+
+
+def run_scenario(scenario: dict, url: str) -> dict:
+    """
+    This runs a scenario's batch on a fresh client after warming its connections up. It's run
+    in its own process, so the cpu time and peak rss are the scenario's alone.
+
+    Args:
+        scenario: The scenario eg {'client': 'aiohttp', 'batch_size': 1000, ...}.
+        url: The base url of the stand-in server.
+
+    Returns:
+        result: The scenario and its measurements eg {'rps': ..., 'latency_ms': ..., ...}.
+    """
+    # Request logging would dominate the client's own overhead
+    Logger.level = logging.WARNING
+    args = [scenario[k] for k in ["batch_size", "latency", "payload", "errors"]]
+    batch = stand_in_batch(url, *args)
+    concurrency = scenario["concurrency"]
+    requests = CLIENTS[scenario["client"]](reuse=True, max_in_flight=concurrency)
+    requests.request(batch[:concurrency], report=False)
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    response = requests.request(batch, report=False)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    requests.shutdown()
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss /= 2**20 if sys.platform == "darwin" else 2**10
+    latency = response["stats"]["latency"]
+    return {
+        **scenario,
+        "seconds": round(wall, 3),
+        "rps": round(scenario["batch_size"] / wall, 1),
+        "cpu_ms_per_request": round(cpu * 1e3 / scenario["batch_size"], 4),
+        "peak_rss_mb": round(rss, 1),
+        "latency_ms": {
+            k: latency[k] and round(latency[k] * 1e3, 3)
+            for k in ["p50", "p90", "p99", "p99.9", "max"]
+        },
+        "error_rate": response["stats"]["error_rate"],
+    }
+
+
+def commit() -> None | str:
+    """
+    This gets the commit being benchmarked.
+
+    Returns:
+        commit: The commit hash, or None outside of a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """
+    This compares results with a baseline run's, scenario by scenario.
+
+    Args:
+        results: The results of this run.
+        baseline: The results of the baseline run.
+        tolerance: The fraction by which rps may drop or cpu per request may rise.
+
+    Returns:
+        regressions: A description of each regression.
+    """
+    baseline = {tuple(r[k] for k in SCENARIO_KEYS): r for r in baseline}
+    regressions = []
+    for r in results:
+        old = baseline.get(tuple(r[k] for k in SCENARIO_KEYS))
+        if not old:
+            continue
+        rps = r["rps"] / old["rps"] - 1
+        cpu = r["cpu_ms_per_request"] / old["cpu_ms_per_request"] - 1
+        name = " ".join(f"{k}={r[k]}" for k in SCENARIO_KEYS)
+        print(f"{name}: rps {rps:+.1%} cpu/request {cpu:+.1%}")
+        if rps < -tolerance or cpu > tolerance:
+            regressions.append(f"{name}: rps {rps:+.1%} cpu/request {cpu:+.1%}")
+    return regressions
+
+
+def main(args: None | list[str] = None) -> dict:
+    """
+    This runs every scenario, prints and records the results and compares them with a baseline.
+
+    Args:
+        args: The command line arguments.
+
+    Returns:
+        run: The run's metadata and results eg {'meta': ..., 'results': [...]}.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", nargs="+", default=list(CLIENTS))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[100, 1000])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[10, 100])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--payload", type=int, default=256)
+    parser.add_argument("--errors", type=float, default=0.0)
+    parser.add_argument("--json", help="The path to write the results to.")
+    parser.add_argument("--compare", help="The path of a baseline results file.")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(args)
+
+    scenarios = [
+        {
+            "client": client,
+            "batch_size": batch_size,
+            "concurrency": concurrency,
+            "latency": args.latency,
+            "payload": args.payload,
+            "errors": args.errors,
+        }
+        for client, batch_size, concurrency in itertools.product(
+            args.clients, args.batch_sizes, args.concurrency
+        )
+    ]
+
+    context = multiprocessing.get_context("spawn")
+    server = StandInServer().start()
+    results = []
+    try:
+        for scenario in scenarios:
+            with ProcessPoolExecutor(1, context) as executor:
+                result = executor.submit(run_scenario, scenario, server.url).result()
+            results.append(result)
+            print(
+                f"{result['client']:>8} batch={result['batch_size']:<6} "
+                f"concurrency={result['concurrency']:<5} {result['rps']:>10} req/s "
+                f"{result['cpu_ms_per_request']:>8} cpu ms/req "
+                f"{result['peak_rss_mb']:>7} MB p99={result['latency_ms']['p99']} ms"
+            )
+    finally:
+        server.stop()
+        # The workers log under the same run_info as this process would
+        Logger.get_logger()
+        Logger.delete_run_info()
+
+    run = {
+        "meta": {
+            "commit": commit(),
+            "time": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(run, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        if regressions:
+            print("Regressions:", *regressions, sep="\n  ")
+            run["regressions"] = regressions
+    return run
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main().get("regressions") else 0)
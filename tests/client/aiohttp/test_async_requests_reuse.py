@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+async def test_request_reuse(server):
+    async_requests = AsyncRequests(root_dir=root_dir, reuse=True, keepalive_timeout=30)
+    assert async_requests.connector_configs["keepalive_timeout"] == 30
+
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+    for _ in range(3):
+        response = await async_requests.async_request(batch, report=False)
+        assert response["responses"][0]["actual_code"] == "200"
+        assert async_requests.session is not None
+
+    assert len(server.peers) == 1
+
+    await async_requests.close()
+    assert async_requests.session is None
+
+    async_requests.logging.delete_run_info(root_dir)
+
+
+async def test_request_no_reuse(server):
+    server.peers.clear()
+    async_requests = AsyncRequests(root_dir=root_dir)
+
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+    for _ in range(2):
+        await async_requests.async_request(batch, report=False)
+        assert async_requests.session is None
+
+    assert len(server.peers) == 2
+
+    async_requests.logging.delete_run_info(root_dir)
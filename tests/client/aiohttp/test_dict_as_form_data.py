@@ -8,7 +8,7 @@ from apiautomationtools.client import AsyncRequests
 pytestmark = pytest.mark.client
 
 root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
-expected_form_data = """[(<MultiDict('name': 'field1')>, {}, 'value1'), (<MultiDict('name': 'file', 'filename': 'test_dict_as_form_data.py')>, {'Content-Type': 'text/html'}, <_io.BufferedReader name='root_dir/tests/client/aiohttp/test_dict_as_form_data.py'>)]"""
+expected_form_data = """[(<MultiDict('name': 'field1')>, {}, 'value1'), (<MultiDict('name': 'file', 'filename': 'test_dict_as_form_data.py')>, {'Content-Type': 'text/html'}, <MappedFile name='root_dir/tests/client/aiohttp/test_dict_as_form_data.py'>)]"""
 expected_form_data = expected_form_data.replace("root_dir", dh.get_root_dir())
 
 
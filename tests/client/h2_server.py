@@ -0,0 +1,109 @@
+import asyncio
+import threading
+
+import orjson
+from h2.config import H2Configuration
+from h2.connection import H2Connection
+from h2.events import ConnectionTerminated, RequestReceived, StreamEnded
+
+
+class H2Server(object):
+    """
+    A local HTTP/2 (prior knowledge, no TLS) stand-in server that runs on a background thread.
+    """
+
+    def __init__(self, delay: float = 0.05):
+        """
+        This is the constructor for H2Server.
+
+        Args:
+            delay: How long to wait before responding to each request.
+        """
+        self.delay = delay
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.server = None
+        self.port = None
+        self.connections = 0
+        self.streams = 0
+
+    @property
+    def url(self) -> str:
+        """
+        This gets the base url of the server.
+
+        Returns:
+            url: The base url eg http://127.0.0.1:1234.
+        """
+        return f"http://127.0.0.1:{self.port}"
+
+    async def _respond(
+        self,
+        conn: H2Connection,
+        writer: asyncio.StreamWriter,
+        stream_id: int,
+        path: str,
+    ):
+        await asyncio.sleep(self.delay)
+        body = orjson.dumps({"url": f"{self.url}{path}", "stream_id": stream_id})
+        headers = [
+            (":status", "200"),
+            ("content-type", "application/json"),
+            ("content-length", str(len(body))),
+        ]
+        conn.send_headers(stream_id, headers)
+        conn.send_data(stream_id, body, end_stream=True)
+        writer.write(conn.data_to_send())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        conn = H2Connection(H2Configuration(client_side=False, header_encoding="utf-8"))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+
+        paths = {}
+        tasks = set()
+        while data := await reader.read(65535):
+            for event in conn.receive_data(data):
+                if isinstance(event, RequestReceived):
+                    paths[event.stream_id] = dict(event.headers)[":path"]
+                elif isinstance(event, StreamEnded):
+                    self.streams += 1
+                    path = paths.pop(event.stream_id)
+                    task = asyncio.ensure_future(
+                        self._respond(conn, writer, event.stream_id, path)
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif isinstance(event, ConnectionTerminated):
+                    writer.close()
+                    return
+            writer.write(conn.data_to_send())
+        writer.close()
+
+    async def _start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def _stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def start(self) -> "H2Server":
+        """
+        This starts the server.
+
+        Returns:
+            server: The started server.
+        """
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        return self
+
+    def stop(self):
+        """
+        This stops the server.
+        """
+        asyncio.run_coroutine_threadsafe(self._stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
@@ -8,7 +8,7 @@ from apiautomationtools.client import HttpxRequests
 pytestmark = pytest.mark.client
 
 root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
-expected_form_data = """{'data': {'field1': 'value1'}, 'files': [('file', <_io.BufferedReader name='root_dir/tests/client/httpx/test_form_data_separation.py'>)]}"""
+expected_form_data = """{'data': {'field1': 'value1'}, 'files': [('file', <MappedFile name='root_dir/tests/client/httpx/test_form_data_separation.py'>)]}"""
 expected_form_data = expected_form_data.replace("root_dir", dh.get_root_dir())
 
 
@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import threading
+
+from aiohttp import web
+
+
+class LocalServer(object):
+    """
+    A local stand-in for httpbin that runs on a background thread.
+    """
+
+    def __init__(self):
+        """
+        This is the constructor for LocalServer.
+        """
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.runner = None
+        self.port = None
+        self.hits = 0
+        self.peers = set()
+        self.in_flight = 0
+
+    @property
+    def url(self) -> str:
+        """
+        This gets the base url of the server.
+
+        Returns:
+            url: The base url eg http://127.0.0.1:1234.
+        """
+        return f"http://127.0.0.1:{self.port}"
+
+    async def _get(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        delay = float(request.query.get("delay", 0))
+        not delay or await asyncio.sleep(delay)
+        body = {"url": str(request.url), "headers": dict(request.headers)}
+        size = int(request.query.get("size", 0))
+        not size or body.update(data="x" * size)
+        return web.json_response(body, status=int(request.query.get("status", 200)))
+
+    async def _limited(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        if self.in_flight >= int(request.query.get("max", 1)):
+            return web.json_response({}, status=429)
+
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(float(request.query.get("delay", 0)))
+        finally:
+            self.in_flight -= 1
+        return web.json_response({"url": str(request.url)})
+
+    async def _cached(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        headers = {
+            "ETag": '"v1"',
+            "Cache-Control": f"max-age={request.query.get('max_age', 0)}",
+        }
+        if request.headers.get("If-None-Match") == headers["ETag"]:
+            return web.Response(status=304, headers=headers)
+        return web.json_response({"url": str(request.url)}, headers=headers)
+
+    async def _bytes(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        size = int(request.query.get("size", 1024))
+        body = bytes(i % 256 for i in range(size))
+        headers = {"Accept-Ranges": "bytes"}
+        if "Range" not in request.headers:
+            return web.Response(body=body, headers=headers)
+
+        start, stop = request.http_range.start, request.http_range.stop
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+        return web.Response(status=206, body=body[start:stop], headers=headers)
+
+    async def _upload(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        parts = {}
+        async for part in await request.multipart():
+            body = await part.read()
+            parts[part.name] = {
+                "filename": part.filename,
+                "size": len(body),
+                "md5": hashlib.md5(body).hexdigest(),
+            }
+        return web.json_response(parts)
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_route("*", "/get", self._get)
+        app.router.add_route("GET", "/limited", self._limited)
+        app.router.add_route("GET", "/cached", self._cached)
+        app.router.add_route("GET", "/bytes", self._bytes)
+        app.router.add_route("POST", "/upload", self._upload)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def start(self) -> "LocalServer":
+        """
+        This starts the server.
+
+        Returns:
+            server: The started server.
+        """
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+        return self
+
+    def stop(self):
+        """
+        This stops the server.
+        """
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
@@ -0,0 +1,103 @@
+import asyncio
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.adaptive import AdaptiveLimit
+from apiautomationtools.client.scheduler import RequestScheduler
+from apiautomationtools.reporting.histogram import BatchStats
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+
+
+async def run_limited(limit, data, capacity):
+    in_flight = {"all": 0, "max": 0, "throttled": 0}
+
+    async def worker(d):
+        if in_flight["all"] >= capacity:
+            in_flight["throttled"] += 1
+            await asyncio.sleep(0)
+            return {"actual_code": "429"}
+
+        in_flight["all"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["all"])
+        await asyncio.sleep(0.002)
+        in_flight["all"] -= 1
+        return {"actual_code": "200"}
+
+    async for _ in RequestScheduler(max_in_flight=100).stream(
+        worker, data, limit=limit
+    ):
+        pass
+    return in_flight
+
+
+async def test_limit_grows():
+    # A loose tolerance keeps loop jitter on a busy machine from counting as congestion
+    limit = AdaptiveLimit(100, tolerance=10)
+    in_flight = await run_limited(limit, [{}] * 300, 100)
+    assert limit.limit > 10
+    assert in_flight["max"] > 10
+    assert limit.history[0][1] == 10
+    assert max(n for _, n in limit.history) > 10
+
+
+async def test_limit_backs_off():
+    limit = AdaptiveLimit(100)
+    in_flight = await run_limited(limit, [{}] * 500, 8)
+    assert in_flight["throttled"] < 50
+    assert limit.limit <= 10
+    assert not limit.slow_start
+    assert min(n for _, n in limit.history) < 8
+
+
+async def test_limit_errors():
+    limit = AdaptiveLimit(100, initial=20)
+
+    async def worker(d):
+        raise ValueError(d["index"])
+
+    with pytest.raises(ValueError):
+        async for _ in RequestScheduler().stream(worker, [{"index": 0}], limit=limit):
+            pass
+    assert limit.limit == 10
+    assert limit.in_flight == 0
+
+
+def test_batch_stats_concurrency():
+    stats, other = BatchStats(), BatchStats()
+    stats.limits.append([(0, 10), (0.2, 5)])
+    other.limits.append([(0.1, 10), (0.3, 11)])
+    stats.merge(other)
+
+    concurrency = stats.summary(1)["concurrency"]
+    assert concurrency["history"] == [(0.1, 20), (0.2, 15), (0.3, 16)]
+    assert concurrency["limit"] == 16
+    assert concurrency["min"] == 15
+    assert concurrency["max"] == 20
+    assert "concurrency" not in BatchStats().summary(1)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_client_adaptive(server, client):
+    url = f"{server.url}/limited?max=10&delay=0.01"
+    batch = [{"method": "get", "headers": {}, "url": url}] * 300
+
+    requests = client(root_dir=root_dir, max_in_flight=100, adaptive=True)
+    response = requests.request(batch, report=False)
+    codes = [r["actual_code"] for r in response["responses"]]
+    assert codes.count("429") < 30
+
+    concurrency = response["stats"]["concurrency"]
+    assert concurrency["history"][0][1] == 10
+    assert concurrency["min"] <= 10 < concurrency["max"]
+    assert concurrency["max"] <= 100
+
+    requests = client(root_dir=root_dir, max_in_flight=100)
+    response = requests.request(batch, report=False)
+    assert "concurrency" not in response["stats"]
+
+    requests.logging.delete_run_info(root_dir)
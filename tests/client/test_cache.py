@@ -0,0 +1,131 @@
+import os
+import threading
+
+import pytest
+from multidict import CIMultiDict
+
+from apiautomationtools.client import (AsyncRequests, HttpxRequests,
+                                       ResponseCache)
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+def test_freshness():
+    assert ResponseCache.freshness({"Cache-Control": "no-store", "ETag": "a"}) is None
+    assert ResponseCache.freshness({"Cache-Control": "max-age=0"}) is None
+
+    freshness = ResponseCache.freshness({"cache-control": "max-age=60"})
+    assert freshness["etag"] is None
+
+    freshness = ResponseCache.freshness({"Cache-Control": "no-cache", "ETag": "a"})
+    assert freshness["etag"] == "a"
+
+
+def test_lru_budget():
+    cache = ResponseCache(max_bytes=10)
+    for key in [b"a", b"b", b"c"]:
+        cache.put(key, {"content": b"1234"})
+
+    assert cache.get(b"a") is None
+    assert cache.get(b"b") and cache.get(b"c")
+    assert cache.size == 8
+
+    cache.put(b"d", {"content": b"12345678901"})
+    assert cache.get(b"d") is None
+
+
+async def test_disk_off_loop(tmp_path):
+    threads = []
+
+    def watched(cache: ResponseCache) -> ResponseCache:
+        for name in ["_read", "_write"]:
+            method = getattr(cache, name)
+
+            def wrapped(*args, method=method):
+                threads.append(threading.current_thread())
+                return method(*args)
+
+            setattr(cache, name, wrapped)
+        return cache
+
+    cache = watched(ResponseCache(path=f"{tmp_path}/cache.db"))
+    entry = {
+        "method": "GET",
+        "status": "200",
+        "headers": CIMultiDict([("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")]),
+        "content": b"1234",
+        "encoding": "utf-8",
+        "expires": 1.5,
+        "etag": '"a"',
+        "last_modified": None,
+    }
+    await cache.store(b"a", entry)
+    assert await cache.load(b"a") == entry
+    cache.close()
+
+    cache = watched(ResponseCache(path=f"{tmp_path}/cache.db"))
+    assert await cache.load(b"a") == entry
+    assert await cache.load(b"b") is None
+    assert cache.get(b"a")["headers"].getall("Set-Cookie") == ["a=1", "b=2"]
+    assert len(threads) == 3 and threading.current_thread() not in threads
+    cache.close()
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_cache_statuses(server, client):
+    cache = ResponseCache()
+    requests = client(root_dir=root_dir, cache=cache)
+
+    stale = {"method": "get", "headers": headers, "url": f"{server.url}/cached"}
+    fresh = {
+        "method": "get",
+        "headers": headers,
+        "url": f"{server.url}/cached?max_age=60",
+    }
+    post = {"method": "post", "headers": headers, "url": f"{server.url}/get"}
+
+    hits = server.hits
+    for statuses in [["miss", "miss", None], ["revalidated", "hit", None]]:
+        responses = requests.request([stale, fresh, post])["responses"]
+        assert [r["cache_status"] for r in responses] == statuses
+        assert all(r["actual_code"] == "200" for r in responses)
+        assert responses[0]["json"]["url"] == stale["url"]
+        assert responses[1]["json"]["url"] == fresh["url"]
+    assert server.hits - hits == 5
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_disk_cache(server, client, tmp_path):
+    batch = {
+        "method": "get",
+        "headers": headers,
+        "url": f"{server.url}/cached?max_age=60",
+    }
+
+    for status in ["miss", "hit"]:
+        cache = ResponseCache(path=f"{tmp_path}/cache.db")
+        requests = client(root_dir=root_dir, cache=cache, body="raw")
+        response = requests.request(batch, report=False)["responses"][0]
+        assert response["cache_status"] == status
+        assert response["json"]["url"] == batch["url"]
+
+        requests.shutdown()
+        cache.close()
+
+    requests.logging.delete_run_info(root_dir)
+
+
+def test_not_cached(server):
+    requests = AsyncRequests(root_dir=root_dir)
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/cached"}
+    response = requests.request(batch, report=False)["responses"][0]
+    assert "cache_status" not in response
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
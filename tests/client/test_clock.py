@@ -0,0 +1,38 @@
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.clock import MonotonicClock
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+def test_clock_utc():
+    clock = MonotonicClock()
+    t0 = clock.now()
+    t1 = clock.now()
+    assert t1 >= t0
+
+    assert clock.utc(clock.anchor) == clock.wall
+    assert (clock.utc(clock.anchor + 1500000) - clock.wall).total_seconds() == 0.0015
+    assert abs((clock.utc(t1) - datetime.now(timezone.utc)).total_seconds()) < 1
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_full_resolution_response_seconds(server, client):
+    requests = client(root_dir=root_dir)
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+    response = requests.request(batch, report=False)["responses"][0]
+
+    assert 0 < response["response_seconds"] < 0.5
+    assert response["response_seconds"] != round(response["response_seconds"], 2)
+    utc_time = datetime.fromisoformat(response["utc_time"])
+    assert abs((utc_time - datetime.now(timezone.utc)).total_seconds()) < 5
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.coalescing import RequestCoalescer
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {"Accept": "application/json"}
+
+
+def test_key():
+    key = RequestCoalescer.key("get", "http://a/get", {"headers": {"a": 1, "b": 2}})
+    assert key == RequestCoalescer.key(
+        "GET", "http://a/get", {"headers": {"b": 2, "a": 1}}
+    )
+    assert key != RequestCoalescer.key("get", "http://a/get", {"headers": {"a": 2}})
+    assert RequestCoalescer.key("post", "http://a/get", {}) is None
+
+
+async def test_send_error():
+    async def send():
+        raise ValueError()
+
+    coalescer = RequestCoalescer()
+    with pytest.raises(ValueError):
+        await coalescer.send(b"key", send)
+    with pytest.raises(ValueError):
+        await coalescer.send(b"key", send)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_coalesced_batch(server, client):
+    requests = client(root_dir=root_dir, coalesce=True)
+    url = f"{server.url}/get?delay=0.05"
+    batch = [
+        {"description": f"get {i}", "method": "get", "headers": headers, "url": url}
+        for i in range(10)
+    ]
+    batch += [{"method": "post", "headers": headers, "url": url}] * 2
+    batch += [{"method": "get", "headers": {}, "url": url}]
+
+    hits = server.hits
+    responses = requests.request(batch)["responses"]
+
+    assert server.hits - hits == 4
+    assert len(responses) == 13
+    assert [r["coalesced"] for r in responses].count(True) == 9
+    assert all(r["actual_code"] == "200" for r in responses)
+    assert all(r["json"]["url"] == url for r in responses)
+    assert all(r["response_seconds"] >= 0.04 for r in responses)
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_not_overlapping(server, client):
+    requests = client(root_dir=root_dir, coalesce=True)
+    batch = [{"method": "get", "headers": headers, "url": f"{server.url}/get"}] * 3
+
+    hits = server.hits
+    responses = requests.request(batch, delay=0.3, report=False)["responses"]
+    assert server.hits - hits == 3
+    assert not any(r["coalesced"] for r in responses)
+    assert all(r["response_seconds"] > 0 for r in responses)
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_not_coalesced(server, client):
+    requests = client(root_dir=root_dir)
+    batch = [{"method": "get", "headers": headers, "url": f"{server.url}/get"}] * 3
+
+    hits = server.hits
+    responses = requests.request(batch, report=False)["responses"]
+    assert server.hits - hits == 3
+    assert "coalesced" not in responses[0]
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
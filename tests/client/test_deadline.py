@@ -0,0 +1,100 @@
+import asyncio
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.record import TIMED_OUT
+from apiautomationtools.client.scheduler import RequestScheduler
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+
+
+async def test_remaining():
+    assert RequestScheduler.remaining(None, None) is None
+    assert RequestScheduler.remaining(2, None) == 2
+
+    now = asyncio.get_running_loop().time()
+    assert 4 < RequestScheduler.remaining(None, now + 5) <= 5
+    assert RequestScheduler.remaining(2, now + 5) == 2
+    assert RequestScheduler.remaining(2, now - 1) == 0
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_client_timeout(server, client):
+    batch = [
+        {"method": "get", "headers": {}, "url": f"{server.url}/get?delay={d}"}
+        for d in [0, 5, 0, 5]
+    ]
+    requests = client(root_dir=root_dir, timeout=0.5)
+    response = requests.request(batch)
+    assert response["duration"] < 2
+
+    responses = response["responses"]
+    assert [r["timed_out"] for r in responses] == [False, True, False, True]
+    assert [r["actual_code"] for r in responses] == ["200", TIMED_OUT] * 2
+    assert 0.5 <= responses[1]["response_seconds"] < 2
+    assert response["stats"]["timeouts"] == {"count": 2, "rate": 0.5}
+
+    requests.logging.delete_run_info(root_dir)
+
+
+def test_httpx_client_timeout(server):
+    batch = [
+        {"method": "get", "headers": {}, "url": f"{server.url}/get?delay={d}"}
+        for d in [0, 5, 0, 5]
+    ]
+    requests = HttpxRequests(root_dir=root_dir, timeout=5)
+    assert requests.client_configs["timeout"] == 5
+
+    # The per request httpx timeout runs out first
+    response = requests.request(batch, timeout=0.5)
+    assert response["duration"] < 2
+
+    responses = response["responses"]
+    assert [r["timed_out"] for r in responses] == [False, True, False, True]
+    assert [r["actual_code"] for r in responses] == ["200", TIMED_OUT] * 2
+    assert 0.5 <= responses[1]["response_seconds"] < 2
+    assert response["stats"]["timeouts"] == {"count": 2, "rate": 0.5}
+
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_client_deadline(server, client):
+    slow = {"method": "get", "headers": {}, "url": f"{server.url}/get?delay=5"}
+    fast = {"method": "get", "headers": {}, "url": f"{server.url}/get"}
+    requests = client(root_dir=root_dir, max_in_flight=2, deadline=0.5)
+    response = requests.request([fast] + [slow] * 10, delay=0.01, report=False)
+    assert response["duration"] < 2
+
+    responses = response["responses"]
+    assert len(responses) == 11
+    assert responses[0]["actual_code"] == "200"
+    assert all(r["timed_out"] for r in responses[1:])
+    assert response["stats"]["timeouts"]["count"] == 10
+
+    # Entries delayed past the deadline aren't held until their delay
+    response = requests.request([fast] * 5, delay=1, report=False)
+    assert response["duration"] < 2
+    assert [r["timed_out"] for r in response["responses"]][-3:] == [True] * 3
+
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_client_timeout_coalesced(server, client):
+    batch = [{"method": "get", "headers": {}, "url": f"{server.url}/get?delay=5"}] * 3
+    requests = client(root_dir=root_dir, timeout=0.3, coalesce=True)
+    response = requests.request(batch, report=False)
+    assert response["duration"] < 2
+    assert all(r["actual_code"] == TIMED_OUT for r in response["responses"])
+
+    requests = client(root_dir=root_dir)
+    response = requests.request(dict(batch[0], url=f"{server.url}/get"), report=False)
+    assert "timed_out" not in response["responses"][0]
+    assert "timeouts" not in response["stats"]
+
+    requests.logging.delete_run_info(root_dir)
@@ -0,0 +1,127 @@
+import hashlib
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.file_payload import FilePayloads
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+@pytest.fixture
+def upload(tmp_path):
+    path = f"{tmp_path}/upload.bin"
+    with open(path, "wb") as fd:
+        fd.write(os.urandom(300000))
+    return path
+
+
+def open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def file_fds(directory: str) -> int:
+    fds = [
+        os.path.realpath(f"/proc/self/fd/{fd}") for fd in os.listdir("/proc/self/fd")
+    ]
+    return len([fd for fd in fds if fd.startswith(str(directory))])
+
+
+def test_file_payloads(upload):
+    payloads = FilePayloads()
+    fds = open_fds()
+    file1, file2 = payloads.open(upload), payloads.open(upload)
+    assert open_fds() <= fds + 1
+    assert file1.mapping is file2.mapping
+
+    with open(upload, "rb") as fd:
+        content = fd.read()
+    assert file1.read(10) == content[:10]
+    assert file2.read() == content
+    assert file1.seek(0, os.SEEK_END) == len(content)
+    assert file1.read() == b""
+
+    file1.seek(5)
+    assert bytes(file1.view()) == content[5:]
+    payloads.clear()
+    assert not payloads.mappings
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_upload(server, client, upload):
+    requests = client(root_dir=root_dir)
+    batch = [
+        {
+            "method": "post",
+            "headers": headers,
+            "url": f"{server.url}/upload",
+            "data": {"field1": "value1", "file": upload},
+        }
+        for _ in range(20)
+    ]
+    with open(upload, "rb") as fd:
+        md5 = hashlib.md5(fd.read()).hexdigest()
+
+    requests.request({**batch[0], "data": {"field1": "value1"}}, report=False)
+    fds = open_fds()
+    responses = requests.request(batch)["responses"]
+    assert open_fds() <= fds + 1
+
+    for response in responses:
+        assert response["json"]["field1"]["size"] == 6
+        assert response["json"]["file"]["filename"] == "upload.bin"
+        assert response["json"]["file"]["size"] == 300000
+        assert response["json"]["file"]["md5"] == md5
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+def test_file_payloads_released(tmp_path):
+    payloads = FilePayloads()
+    paths = []
+    for i in range(50):
+        paths.append(f"{tmp_path}/upload{i}.bin")
+        with open(paths[-1], "wb") as fd:
+            fd.write(os.urandom(1000))
+
+    fds = open_fds()
+    files = [payloads.open(path) for path in paths]
+    files += [payloads.open(paths[0])]
+    assert len(payloads.mappings) == 50
+
+    for file in files[1:]:
+        file.close()
+    assert list(payloads.mappings.values())[0][1] == 1
+    assert len(payloads.mappings) == 1
+
+    files[0].close()
+    del files
+    assert not payloads.mappings
+    assert open_fds() <= fds
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_upload_released(server, client, tmp_path):
+    requests = client(root_dir=root_dir)
+    batch = []
+    for i in range(20):
+        path = f"{tmp_path}/upload{i}.bin"
+        with open(path, "wb") as fd:
+            fd.write(os.urandom(1000))
+        url = f"{server.url}/upload"
+        batch.append(
+            {"method": "post", "headers": headers, "url": url, "data": {"file": path}}
+        )
+
+    responses = requests.request(batch, report=False)["responses"]
+    assert all(r["json"]["file"]["size"] == 1000 for r in responses)
+    # The server's sockets share the process, so only the files' descriptors are counted
+    assert not file_fds(tmp_path)
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
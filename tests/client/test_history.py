@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from apiautomationtools.client import (AsyncRequests, BatchHistory,
+                                       HttpxRequests)
+from apiautomationtools.client.record import ResponseRecord
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+def batch(n: int) -> dict:
+    record = ResponseRecord({"index": 1, "json": {"n": n}, "server_headers": {}})
+    return {"duration": n, "responses": [record], "stats": {}}
+
+
+def test_batch_history_in_memory():
+    history = BatchHistory()
+    for n in range(3):
+        history.append(batch(n))
+
+    assert len(history) == 3
+    assert history[-1]["duration"] == 2
+    assert len(history.batches) == 3
+    assert not history.offsets
+
+
+def test_batch_history_max_batches(tmp_path):
+    history = BatchHistory(max_batches=2, path=f"{tmp_path}/history.jsonl")
+    for n in range(5):
+        history.append(batch(n))
+
+    assert len(history) == 5
+    assert len(history.batches) == 2
+    assert [b["duration"] for b in history] == [0, 1, 2, 3, 4]
+    assert history[0]["responses"][0]["json"] == {"n": 0}
+    assert type(history[0]["responses"][0]) is ResponseRecord
+    assert [b["duration"] for b in history[1:3]] == [1, 2]
+
+    history.close()
+    assert history[1]["duration"] == 1
+    history.append(batch(5))
+    assert history[5]["duration"] == 5
+    assert history[0]["duration"] == 0
+
+
+def test_batch_history_max_bytes(tmp_path):
+    history = BatchHistory(max_bytes=1, path=f"{tmp_path}/history.jsonl")
+    for n in range(3):
+        history.append(batch(n))
+
+    assert not history.batches
+    assert history.size == 0
+    assert [b["duration"] for b in history] == [0, 1, 2]
+
+    with pytest.raises(IndexError):
+        history[3]
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_client_history(server, client):
+    requests = client(root_dir=root_dir, history_batches=1)
+    for _ in range(3):
+        requests.request(
+            {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+        )
+
+    history = requests._return_history
+    assert len(history) == 3
+    assert len(history.batches) == 1
+    assert os.path.exists(history.path)
+
+    first = history[0]["responses"][0]
+    assert first["batch_number"] == 1
+    assert first["actual_code"] == "200"
+    assert first["server_headers"]["Content-Type"].startswith("application/json")
+
+    requests.shutdown()
+    history.close()
+    requests.logging.delete_run_info(root_dir)
+
+
+def test_batch_history_shared_path(tmp_path):
+    path = f"{tmp_path}/history.jsonl"
+    first, second = BatchHistory(1, path=path), BatchHistory(1, path=path)
+    assert first.path != second.path
+
+    for n in range(3):
+        first.append(batch(n))
+        second.append(batch(n + 10))
+    assert [b["duration"] for b in first] == [0, 1, 2]
+    assert [b["duration"] for b in second] == [10, 11, 12]
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_clients_history(server, client):
+    first = client(root_dir=root_dir, history_batches=1)
+    second = client(root_dir=root_dir, history_batches=1)
+    for requests, n in [(first, 1), (second, 2), (first, 3), (second, 4)]:
+        url = f"{server.url}/get?n={n}"
+        requests.request({"method": "get", "headers": headers, "url": url})
+
+    assert first._return_history[0]["responses"][0]["url"].endswith("n=1")
+    assert second._return_history[0]["responses"][0]["url"].endswith("n=2")
+
+    for requests in [first, second]:
+        requests.shutdown()
+        requests._return_history.close()
+    first.logging.delete_run_info(root_dir)
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from apiautomationtools.client import HttpxRequests
+from apiautomationtools.client.connections import connection_token
+
+pytest.importorskip("h2")
+from tests.client.h2_server import H2Server  # noqa: E402
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = H2Server(delay=0.05).start()
+    yield server
+    server.stop()
+
+
+def test_http2_multiplexing(server):
+    requests = HttpxRequests(root_dir=root_dir, http2=True, http1=False)
+    batch = [{"method": "get", "headers": headers, "url": f"{server.url}/get"}] * 50
+
+    connections = server.connections
+    response = requests.request(batch, report=False)
+    responses = response["responses"]
+
+    assert all(r["actual_code"] == "200" for r in responses)
+    assert all(r["http_version"] == "HTTP/2" for r in responses)
+    assert len({r["json"]["stream_id"] for r in responses}) == 50
+    assert response["duration"] < 50 * 0.05
+
+    stats = response["stats"]["connections"]
+    assert stats["count"] == server.connections - connections
+    assert stats["streams_per_connection"] >= 25
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+def test_connection_tokens_not_reused():
+    class Stream(object):
+        pass
+
+    stream = Stream()
+    token = connection_token(stream)
+    assert connection_token(stream) == token
+    assert connection_token(None) is None
+
+    # A later connection can take a closed one's id(), but never its token
+    tokens = {token}
+    for _ in range(100):
+        tokens.add(connection_token(Stream()))
+    assert len(tokens) == 101
@@ -0,0 +1,135 @@
+import asyncio
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.loop_runner import LoopRunner, loop_factory, run
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+def test_runner_keeps_one_loop():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    runner = LoopRunner()
+    loops = [runner.run(current_loop()) for _ in range(2)]
+    loops += [runner.submit(current_loop()).result()]
+    assert loops[0] is loops[1] is loops[2] is runner.loop
+
+    runner.stop()
+    assert not runner.running
+
+
+def test_runner_run_from_own_loop():
+    runner = LoopRunner()
+
+    async def nested():
+        runner.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        runner.run(nested())
+    runner.stop()
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_request_reuse_between_sync_calls(server, client):
+    server.peers.clear()
+    requests = client(root_dir=root_dir, reuse=True)
+
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+    for _ in range(3):
+        response = requests.request(batch, report=False)
+        assert response["responses"][0]["actual_code"] == "200"
+    assert len(server.peers) == 1
+
+    requests.shutdown()
+    assert not requests.runner.running
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_request_reuse_other_loop(server, client):
+    requests = client(root_dir=root_dir, reuse=True)
+    attr = "session" if client is AsyncRequests else "client"
+    closed = "closed" if client is AsyncRequests else "is_closed"
+
+    # The session opened on the client's own loop is closed there for the new loop
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+    requests.request(batch, report=False)
+    opened = getattr(requests, attr)
+    response = asyncio.run(requests.async_request(batch, report=False))
+    assert response["responses"][0]["actual_code"] == "200"
+    assert getattr(opened, closed)
+    assert not getattr(getattr(requests, attr), closed)
+
+    # One left on a finished loop is let go, so the client carries on over loops in a row
+    for _ in range(2):
+        opened = getattr(requests, attr)
+        response = asyncio.run(requests.async_request(batch, report=False))
+        assert response["responses"][0]["actual_code"] == "200"
+        assert getattr(requests, attr) is not opened
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_submit(server, client):
+    requests = client(root_dir=root_dir)
+
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+    futures = [requests.submit(batch, report=False) for _ in range(2)]
+    batch_numbers = sorted(f.result()["responses"][0]["batch_number"] for f in futures)
+    assert batch_numbers == [1, 2]
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+def test_loop_factory():
+    assert loop_factory() is asyncio.new_event_loop
+    assert loop_factory("asyncio") is asyncio.new_event_loop
+    assert loop_factory(asyncio.new_event_loop) is asyncio.new_event_loop
+    with pytest.raises(ValueError):
+        loop_factory("unknown")
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_request_loop(server, client):
+    loops = []
+
+    def new_loop() -> asyncio.AbstractEventLoop:
+        loops.append(asyncio.new_event_loop())
+        return loops[-1]
+
+    requests = client(root_dir=root_dir, loop=new_loop)
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+    assert requests.request(batch, report=False)["responses"][0]["actual_code"] == "200"
+    assert loops == [requests.runner.loop]
+    requests.shutdown()
+
+    response = run(requests.async_request(batch, report=False), loop=new_loop)
+    assert response["responses"][0]["actual_code"] == "200"
+    assert len(loops) == 2 and loops[1].is_closed()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_request_uvloop(server, client):
+    uvloop = pytest.importorskip("uvloop")
+
+    async def loop_type() -> type:
+        return type(asyncio.get_running_loop())
+
+    requests = client(root_dir=root_dir, loop="uvloop")
+    assert requests.runner.run(loop_type()) is uvloop.Loop
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+    assert requests.request(batch, report=False)["responses"][0]["actual_code"] == "200"
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
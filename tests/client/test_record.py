@@ -0,0 +1,146 @@
+import os
+import pickle
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests, record
+from apiautomationtools.client.record import (FIELDS, ResponseRecord,
+                                              decode_body, intern_headers)
+from apiautomationtools.reporting import response_csv as rc
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+def test_decode_body():
+    assert decode_body(b'{"a": [1]}') == {"a": [1]}
+    assert decode_body(b"not json") == "not json"
+    assert decode_body(b"") == ""
+
+
+def test_response_record_decodes_once():
+    record = ResponseRecord({"actual_code": "200"}, b'{"a": 1}')
+    assert "b'{" in repr(record)
+    assert not record._decoded
+
+    assert record["json"] == {"a": 1}
+    assert record._decoded
+    assert record["json"] is record.get("json")
+    assert dict(record) == {"actual_code": "200", "json": {"a": 1}}
+
+    record = ResponseRecord({"actual_code": "200"}, b'{"a": 1}')
+    assert list(record.values()) == ["200", {"a": 1}]
+
+    record = ResponseRecord({"actual_code": "200"}, b'{"a": 1}')
+    record["json"] = "replaced"
+    assert record.copy()["json"] == "replaced"
+
+
+def test_response_record_fields():
+    record = ResponseRecord({"actual_code": "200", "json": {"a": 1}, "timings": {}})
+    assert not hasattr(record, "__dict__")
+    assert list(record) == ["actual_code", "json", "timings"]
+    assert record.extra == {"timings": {}}
+
+    record["cache_status"] = "hit"
+    assert record == {
+        "actual_code": "200",
+        "json": {"a": 1},
+        "timings": {},
+        "cache_status": "hit",
+    }
+    assert record.pop("actual_code") == "200"
+    assert "actual_code" not in record
+    with pytest.raises(KeyError):
+        record["url"]
+
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_intern_headers():
+    first = intern_headers({"".join(["X-", "Request-Id"]): "1"})
+    second = intern_headers({"".join(["X-", "Request-Id"]): "2"})
+    assert next(iter(first)) is next(iter(second))
+    assert second["x-request-id"] == "2"
+
+    first = intern_headers({"Content-Type": "".join(["text/", "plain"]), "Date": "a"})
+    second = intern_headers({"Content-Type": "".join(["text/", "plain"]), "Date": "a"})
+    assert first["content-type"] is second["content-type"]
+    assert "a" not in record.HEADER_VALUES
+
+
+def test_intern_headers_bounded(monkeypatch):
+    monkeypatch.setattr(record, "MAX_SHARED", 10)
+    monkeypatch.setattr(record, "HEADER_NAMES", {})
+    monkeypatch.setattr(record, "HEADER_VALUES", {})
+    for i in range(100):
+        headers = intern_headers({f"X-Header-{i}": f"value {i}"})
+        assert headers[f"x-header-{i}"] == f"value {i}"
+    assert len(record.HEADER_NAMES) == len(record.HEADER_VALUES) == 10
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_record_report_columns(server, client):
+    requests = client(root_dir=root_dir, keep_payloads=False)
+    batch = {
+        "method": "post",
+        "headers": headers,
+        "url": f"{server.url}/get",
+        "json": {"a": 1},
+    }
+    response = requests.request(batch)["responses"][0]
+
+    assert type(response) is ResponseRecord
+    assert list(response)[: len(FIELDS)] == list(FIELDS)
+    assert "json" not in response["kwargs"]
+    assert response["json"]["url"] == f"{server.url}/get"
+
+    columns = rc.read_csv(requests.csv_path)[0]
+    assert columns[-3:] == ["BODY", "RESPONSE_SECONDS", "DELAY_SECONDS"]
+    assert (
+        columns[: len(FIELDS) - 3]
+        == [
+            f.upper() for f in FIELDS if f not in ["response_seconds", "delay_seconds"]
+        ][: len(FIELDS) - 3]
+    )
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_raw_body(server, client):
+    requests = client(root_dir=root_dir, body="raw")
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+    response = requests.request(batch)["responses"][0]
+
+    assert type(response) is ResponseRecord
+    assert response.content.startswith(b"{")
+    assert response["json"]["url"] == f"{server.url}/get"
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_unknown_body(client):
+    with pytest.raises(ValueError, match="'json', 'raw', 'none'"):
+        client(root_dir=root_dir, body="text")
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_no_body(server, client):
+    requests = client(root_dir=root_dir, reuse=True, max_in_flight=1, body="none")
+    batch = [{"method": "get", "headers": headers, "url": f"{server.url}/get"}] * 3
+    peers = len(server.peers)
+    responses = requests.request(batch, report=False)["responses"]
+
+    assert all(r["actual_code"] == "200" and r["json"] == "" for r in responses)
+    assert type(responses[0]) is ResponseRecord
+    assert responses[0].content is None
+    assert len(server.peers) == peers + 1
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
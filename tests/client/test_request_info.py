@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from apiautomationtools.batch_generation.batch_generation import generate_batch
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_shared_parts_copied_once(client):
+    requests = client(root_dir=root_dir)
+    headers = {"Authorization": "Bearer 123"}
+    body = {"id": "123", "items": [{"id": "456"}]}
+    batch = generate_batch("post", headers, "https://host/items/123", json=body)
+    data, kwargs = requests.build_request_info(batch, 0.1, params={"page": [1]})
+
+    shared = [d for d in data if d["headers"] == headers]
+    assert len({id(d["headers"]) for d in shared}) == 1
+    assert shared[0]["headers"] is not headers
+    assert len({id(d["json"]) for d in data if d["json"] == body}) == 1
+    assert kwargs == {"params": {"page": [1]}}
+
+    headers["Authorization"] = "changed"
+    body["items"][0]["id"] = "changed"
+    assert shared[0]["headers"] == {"Authorization": "Bearer 123"}
+    assert data[0]["json"]["items"][0]["id"] == "456"
+
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_repeated_entries(client):
+    requests = client(root_dir=root_dir)
+    entry = {"method": "get", "headers": {}, "url": "https://host"}
+    data, _ = requests.build_request_info([entry] * 3, 0.5)
+
+    assert [d["index"] for d in data] == [0, 1, 2]
+    assert [d["delay"] for d in data] == [0.5, 1.0, 1.5]
+    assert "index" not in entry
+
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_records_own_parts(server, client):
+    requests = client(root_dir=root_dir)
+    headers = {"Authorization": "Bearer 123"}
+    body = {"id": "123", "items": [{"id": "456"}]}
+    batch = [
+        {"method": "post", "headers": headers, "url": f"{server.url}/get", "json": body}
+    ] * 2
+    responses = requests.request(batch, report=False)["responses"]
+
+    assert responses[0]["headers"] is not responses[1]["headers"]
+    responses[0]["headers"]["Authorization"] = "changed"
+    responses[0]["kwargs"]["json"]["items"][0]["id"] = "changed"
+    assert responses[1]["headers"] == headers
+    assert responses[1]["kwargs"]["json"] == body
+
+    requests.logging.delete_run_info(root_dir)
@@ -0,0 +1,162 @@
+import asyncio
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.scheduler import RequestScheduler
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+
+
+async def run_scheduler(scheduler, data):
+    in_flight = {"all": 0, "max": 0, "hosts": {}, "max_host": 0}
+    seen = []
+
+    async def worker(d):
+        host = scheduler.host(d)
+        in_flight["all"] += 1
+        in_flight["hosts"][host] = in_flight["hosts"].get(host, 0) + 1
+        in_flight["max"] = max(in_flight["max"], in_flight["all"])
+        in_flight["max_host"] = max(in_flight["max_host"], in_flight["hosts"][host])
+        await asyncio.sleep(0.001)
+        seen.append(d["index"])
+        in_flight["all"] -= 1
+        in_flight["hosts"][host] -= 1
+
+    await scheduler.each(worker, data)
+    return in_flight, seen
+
+
+async def test_max_in_flight():
+    data = [{"url": "http://a/get", "index": i} for i in range(200)]
+    in_flight, seen = await run_scheduler(RequestScheduler(max_in_flight=10), data)
+    assert in_flight["max"] == 10
+    assert sorted(seen) == list(range(200))
+
+
+async def test_per_host():
+    data = [{"url": f"http://{'ab'[i % 2]}/get", "index": i} for i in range(100)]
+    scheduler = RequestScheduler(max_in_flight=20, per_host=3)
+    in_flight, seen = await run_scheduler(scheduler, data)
+    assert in_flight["max_host"] <= 3
+    assert sorted(seen) == list(range(100))
+
+
+@pytest.mark.parametrize("rate", [None, 1000])
+async def test_per_host_busy_host(rate):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def worker(d):
+        await asyncio.sleep(0.3 if d["url"] == "http://slow/get" else 0)
+        return d["url"], loop.time() - start
+
+    data = [{"url": f"http://{host}/get"} for host in ["slow"] * 4 + ["fast"] * 4]
+    scheduler = RequestScheduler(max_in_flight=4, per_host=1, rate=rate)
+    results = [r async for r in scheduler.stream(worker, data)]
+
+    # The slow host's queued entries don't hold workers the fast host could use
+    assert max(t for url, t in results if url == "http://fast/get") < 0.2
+    assert max(t for url, t in results if url == "http://slow/get") >= 1.2
+
+
+async def test_delay():
+    data = [{"url": "http://a/get", "index": i, "delay": i * 0.1} for i in range(3)]
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await run_scheduler(RequestScheduler(max_in_flight=1), data)
+    assert loop.time() - start >= 0.2
+
+
+async def test_worker_error():
+    async def worker(d):
+        raise ValueError(d["index"])
+
+    with pytest.raises(ValueError):
+        await RequestScheduler(max_in_flight=2).each(worker, [{"index": 0}])
+
+
+async def test_abandoned_stream():
+    async def worker(d):
+        return d
+
+    data = [{"index": i} for i in range(20)]
+    stream = RequestScheduler(max_in_flight=2, queue_size=1).stream(worker, data)
+    async for _ in stream:
+        break
+    await stream.aclose()
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_client_batch_larger_than_max_in_flight(server, client):
+    requests = client(root_dir=root_dir, max_in_flight=5)
+    batch = [{"method": "get", "headers": {}, "url": f"{server.url}/get"}] * 50
+    response = requests.request(batch, report=False)
+
+    responses = response["responses"]
+    assert [r["index"] for r in responses] == list(range(1, 51))
+    assert all(r["actual_code"] == "200" for r in responses)
+
+    stats = response["stats"]
+    assert stats["count"] == 50
+    assert stats["groups"][0]["latency"]["count"] == 50
+    assert 0 < stats["latency"]["p50"] <= stats["latency"]["max"]
+
+    requests.logging.delete_run_info(root_dir)
+
+
+async def test_rate():
+    data = [{"url": "http://a/get", "index": i} for i in range(20)]
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    in_flight, seen = await run_scheduler(RequestScheduler(rate=100), data)
+    assert loop.time() - start >= 0.19
+    assert in_flight["max"] < 20
+
+    assert [d["scheduled_seconds"] for d in data] == [i / 100 for i in range(20)]
+    assert all(0 <= d["send_lag_seconds"] < 0.05 for d in data)
+
+
+async def test_rate_open_loop():
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def worker(d):
+        await asyncio.sleep(0.2 if d["index"] == 0 else 0)
+
+    # The slow first request holds the only worker, while the rest still arrive on time
+    data = [{"index": i} for i in range(10)]
+    await RequestScheduler(max_in_flight=1, queue_size=1, rate=100).each(worker, data)
+    assert loop.time() - start < 0.3
+    assert data[1]["send_lag_seconds"] >= 0.15
+    assert data[-1]["send_lag_seconds"] >= 0.07
+    assert data[-1]["scheduled_seconds"] == 0.09
+
+
+async def test_rate_worker_error():
+    async def worker(d):
+        await asyncio.sleep(0)
+        raise ValueError(d["index"])
+
+    data = [{"index": i} for i in range(10)]
+    with pytest.raises(ValueError):
+        await RequestScheduler(rate=100).each(worker, data)
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_client_rate(server, client):
+    requests = client(root_dir=root_dir, rate=50)
+    batch = [{"method": "get", "headers": {}, "url": f"{server.url}/get"}] * 10
+    responses = requests.request(batch, report=False)["responses"]
+
+    assert responses[-1]["scheduled_seconds"] == 9 / 50
+    assert all(r["send_lag_seconds"] >= 0 for r in responses)
+    assert "scheduled_seconds" not in responses[-1]["kwargs"]
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from apiautomationtools.client import HttpxRequests, ShardedRequests
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+@pytest.mark.parametrize("client_configs", [{}, {"client": HttpxRequests}])
+def test_sharded_request(server, client_configs):
+    requests = ShardedRequests(
+        root_dir=root_dir, processes=2, reuse=True, **client_configs
+    )
+    batch = [
+        {"method": "get", "headers": headers, "url": f"{server.url}/get", "code": 200}
+    ] * 21
+
+    for batch_number in [1, 2]:
+        response = requests.request(batch)
+        responses = response["responses"]
+        assert [r["index"] for r in responses] == list(range(1, 22))
+        assert all(r["batch_number"] == batch_number for r in responses)
+        assert all(r["actual_code"] == "200" for r in responses)
+
+        stats = response["stats"]
+        assert stats["count"] == 21
+        assert stats["groups"][0]["latency"]["count"] == 21
+
+    assert os.path.exists(requests.csv_path)
+    log_files = os.listdir(os.path.dirname(requests.logging.log_file_path))
+    assert len([f for f in log_files if "_shard_" in f]) == 2
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client_configs", [{}, {"client": HttpxRequests}])
+def test_sharded_upload(server, client_configs, tmp_path):
+    upload = f"{tmp_path}/upload.bin"
+    with open(upload, "wb") as fd:
+        fd.write(os.urandom(1000))
+
+    requests = ShardedRequests(root_dir=root_dir, processes=2, **client_configs)
+    batch = [
+        {
+            "method": "post",
+            "headers": headers,
+            "url": f"{server.url}/upload",
+            "data": {"field1": "value1", "file": upload},
+        }
+        for _ in range(4)
+    ]
+    responses = requests.request(batch, report=False)["responses"]
+    assert all(r["actual_code"] == "200" for r in responses)
+    assert all(r["json"]["file"]["size"] == 1000 for r in responses)
+    assert upload in str(responses[0]["kwargs"])
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
@@ -0,0 +1,63 @@
+import asyncio
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.scheduler import RequestScheduler
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+def slow_first_batch(server):
+    return [
+        {"method": "get", "headers": headers, "url": f"{server.url}/get?delay={d}"}
+        for d in [0.3, 0.2, 0.1, 0]
+    ]
+
+
+async def test_scheduler_stream_ordered():
+    async def worker(d):
+        await asyncio.sleep(d["sleep"])
+        return d["index"]
+
+    data = [{"index": i, "sleep": (10 - i) / 1000} for i in range(10)]
+    scheduler = RequestScheduler(max_in_flight=10)
+
+    unordered = [i async for i in scheduler.stream(worker, data)]
+    assert sorted(unordered) == list(range(10))
+    assert unordered != list(range(10))
+
+    ordered = [i async for i in scheduler.stream(worker, data, ordered=True)]
+    assert ordered == list(range(10))
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+async def test_stream(server, client):
+    requests = client(root_dir=root_dir)
+
+    batch = slow_first_batch(server)
+    indices = [r["index"] async for r in requests.stream(batch)]
+    assert indices == [4, 3, 2, 1]
+
+    batch = slow_first_batch(server)
+    indices = [r["index"] async for r in requests.stream(batch, ordered=True)]
+    assert indices == [1, 2, 3, 4]
+    assert not requests._return_history
+
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_iter_request(server, client):
+    requests = client(root_dir=root_dir)
+
+    records = requests.iter_request(slow_first_batch(server), ordered=True)
+    assert next(records)["index"] == 1
+    assert [r["index"] for r in records] == [2, 3, 4]
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+import os
+import threading
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.stream_sink import (WRITERS, StreamSink,
+                                                   split_ranges)
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+async def test_stream_sink(tmp_path):
+    path = f"{tmp_path}/body"
+    chunks = [os.urandom(1000) for _ in range(50)]
+    async with StreamSink(path, "md5", max_chunks=2) as sink:
+        for chunk in chunks:
+            await sink.write(chunk)
+
+    with open(path, "rb") as fd:
+        assert fd.read() == b"".join(chunks)
+
+    summary = sink.summary()
+    assert summary["stream_bytes"] == 50000
+    assert (
+        summary["stream_digest"] == f"md5:{hashlib.md5(b''.join(chunks)).hexdigest()}"
+    )
+    assert summary["stream_mbps"] > 0
+
+
+async def test_stream_sinks_share_writers(tmp_path):
+    chunks = [os.urandom(1000) for _ in range(20)]
+    threads = set()
+
+    async def download(i: int):
+        async with StreamSink(f"{tmp_path}/body{i}", "md5", max_chunks=2) as sink:
+            for chunk in chunks:
+                await sink.write(chunk)
+                threads.update(t.name for t in threading.enumerate())
+        return sink.summary()["stream_digest"]
+
+    digests = await asyncio.gather(*[download(i) for i in range(100)])
+    assert set(digests) == {f"md5:{hashlib.md5(b''.join(chunks)).hexdigest()}"}
+
+    writers = [name for name in threads if name.startswith("stream-sink")]
+    assert 0 < len(writers) <= WRITERS._max_workers
+
+
+async def test_stream_sink_error(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        async with StreamSink(f"{tmp_path}/missing/body", max_chunks=1) as sink:
+            for _ in range(3):
+                await sink.write(b"chunk")
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_stream_path(server, client, tmp_path):
+    requests = client(root_dir=root_dir, chunk_size=2**16)
+    stream_path = f"{tmp_path}/body"
+    batch = {
+        "method": "get",
+        "headers": headers,
+        "url": f"{server.url}/bytes?size=3000000",
+        "stream_path": stream_path,
+    }
+    response = requests.request(batch, report=False)["responses"][0]
+
+    with open(stream_path, "rb") as fd:
+        digest = hashlib.sha256(fd.read()).hexdigest()
+    assert response["stream_bytes"] == 3000000
+    assert response["stream_digest"] == f"sha256:{digest}"
+    assert response["stream_mbps"] > 0
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+def test_split_ranges():
+    headers = {"Accept-Ranges": "bytes", "Content-Length": "10"}
+    assert split_ranges(headers, 3, 0) == [(0, 4), (4, 8), (8, 10)]
+    assert split_ranges(headers, 3, 11) == []
+    assert split_ranges(headers, 1, 0) == []
+    assert split_ranges({"Content-Length": "10"}, 3, 0) == []
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_ranged_stream_path(server, client, tmp_path):
+    requests = client(
+        root_dir=root_dir, chunk_size=2**16, ranges=4, range_min_size=2**20
+    )
+    stream_path = f"{tmp_path}/body"
+    batch = {
+        "method": "get",
+        "headers": headers,
+        "url": f"{server.url}/bytes?size=3000001",
+        "stream_path": stream_path,
+    }
+
+    hits = server.hits
+    response = requests.request(batch, report=False)["responses"][0]
+    # aiohttp closes the first response and requests its range again
+    assert server.hits - hits == 4 + (client is AsyncRequests)
+    assert response["json"] == ""
+
+    with open(stream_path, "rb") as fd:
+        assert fd.read() == bytes(i % 256 for i in range(3000001))
+    assert response["stream_bytes"] == 3000001
+    assert response["stream_digest"] is None
+    assert response["stream_mbps"] > 0
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+from apiautomationtools.client.tracing import PhaseTimer
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+def test_phase_timer():
+    timer = PhaseTimer()
+    for mark in ["start", "request_sent", "headers_received", "body_end"]:
+        timer.mark(mark)
+    timer.mark("start")
+
+    phases = timer.phases()
+    assert phases["dns"] is None
+    assert phases["total"] >= phases["ttfb"] + phases["body"]
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_request_timings(server, client):
+    requests = client(root_dir=root_dir, reuse=True, trace=True)
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get?delay=0.05"}
+
+    timings = requests.request(batch, report=False)["responses"][0]["timings"]
+    assert timings["connect"] > 0
+    assert timings["ttfb"] >= 0.05
+    assert timings["body"] >= 0
+    assert timings["total"] >= timings["ttfb"]
+
+    timings = requests.request(batch, report=False)["responses"][0]["timings"]
+    assert timings["connect"] is None
+    assert timings["queue"] is None or timings["queue"] < 0.05
+    assert timings["ttfb"] >= 0.05
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_request_no_timings(server, client):
+    requests = client(root_dir=root_dir)
+    batch = {"method": "get", "headers": headers, "url": f"{server.url}/get"}
+
+    response = requests.request(batch, report=False)["responses"][0]
+    assert "timings" not in response
+    assert "extensions" not in response["kwargs"]
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from apiautomationtools.client import AsyncRequests, HttpxRequests
+
+pytestmark = pytest.mark.client
+
+root_dir = f"{os.path.dirname(__file__)}/{__name__.split('.')[-1]}"
+headers = {}
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_warmup(server, client):
+    requests = client(root_dir=root_dir, reuse=True, max_in_flight=3)
+    batch = [{"method": "get", "headers": headers, "url": f"{server.url}/get"}] * 6
+    response = requests.request(batch, report=False)
+    assert "warm" not in response["responses"][0]
+    assert "warm" not in response["stats"]
+    requests.shutdown()
+
+    requests = client(root_dir=root_dir, reuse=True, max_in_flight=3)
+    server.peers.clear()
+    requests.warmup(server.url, connections=3, path="/get")
+    assert len(server.peers) == 3
+    assert len(requests.warm_connections) == 3
+
+    response = requests.request(batch, report=False)
+    assert len(server.peers) == 3
+    assert all(r["warm"] for r in response["responses"])
+    assert response["stats"]["warm"] == {"count": 6, "rate": 1.0}
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+@pytest.mark.parametrize("client", [AsyncRequests, HttpxRequests])
+def test_warmup_cold_connections(server, client):
+    requests = client(root_dir=root_dir, reuse=True, max_in_flight=4)
+    requests.warmup([f"{server.url}/"], connections=1, path="/get")
+
+    batch = [{"method": "get", "headers": headers, "url": f"{server.url}/get"}] * 4
+    batch[0] = {**batch[0], "url": f"{server.url}/get?delay=0.2"}
+    response = requests.request(batch, report=False)
+    warm = [r["warm"] for r in response["responses"]]
+    assert 1 <= sum(warm) < 4
+    assert response["stats"]["warm"]["count"] == sum(warm)
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
+
+
+def test_warmup_needs_reuse(server):
+    requests = AsyncRequests(root_dir=root_dir)
+    with pytest.raises(ValueError):
+        requests.warmup(server.url)
+
+    requests.shutdown()
+    requests.logging.delete_run_info(root_dir)
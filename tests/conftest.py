@@ -0,0 +1,10 @@
+import pytest
+
+from tests.client.local_server import LocalServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = LocalServer().start()
+    yield server
+    server.stop()
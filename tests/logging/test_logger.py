@@ -1,10 +1,12 @@
 import os
+import queue
 from datetime import datetime
+from logging import INFO, LogRecord
 
 import pytest
 
 import apiautomationtools.helpers.directory_helpers as dh
-from apiautomationtools.logging.logger import Logger
+from apiautomationtools.logging.logger import BackgroundHandler, Logger
 
 pytestmark = pytest.mark.logging
 
@@ -52,3 +54,77 @@ def test_logging_by_time():
 def test_logging_custom_root_by_time_():
     root_dir = os.path.dirname(__file__)
     test_logging(root_dir=root_dir, by_time=True)
+
+
+def test_logging_background_writer():
+    class Message(object):
+        text = "lazy message"
+
+        def __repr__(self) -> str:
+            return self.text
+
+    logging = Logger().get_logger()
+    path = Logger().log_file_path
+    assert Logger.listener
+
+    # The message is merged as it's logged, so later changes to the args don't show
+    message = Message()
+    logging.info("This is a %r.", message)
+    message.text = "changed message"
+    logging.warning("This is a flushed message.")
+    with open(path) as f:
+        logs = f.read()
+    assert "This is a lazy message." in logs
+    assert "changed message" not in logs
+    assert "This is a flushed message." in logs
+
+    Logger().stop_listener()
+    assert not Logger.listener
+    logging.info("This is a direct message.")
+    with open(path) as f:
+        assert "This is a direct message." in f.read()
+
+    Logger().delete_run_info()
+
+
+def test_logging_sample():
+    Logger.sample = 3
+    try:
+        logging = Logger().get_logger()
+        path = Logger().log_file_path
+        for i in range(6):
+            logging.info("Sampled message %s.", i)
+            logging.info("Paired message %s.", i)
+        logging.error("Error message.")
+        Logger().stop_listener()
+    finally:
+        Logger.sample = 1
+
+    with open(path) as f:
+        logs = f.read()
+    assert "Sampled message 0." in logs
+    assert "Sampled message 1." not in logs
+    assert "Sampled message 3." in logs
+    assert logs.count("Sampled message") == logs.count("Paired message") == 2
+    assert "Paired message 3." in logs
+    assert "Error message." in logs
+
+    Logger().delete_run_info()
+
+
+def test_logging_bounded_queue():
+    handler = BackgroundHandler(queue.Queue(2))
+    record = LogRecord("test", INFO, __file__, 0, "Message %s.", (1,), None)
+    for _ in range(3):
+        handler.handle(record)
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 1
+    assert handler.queue.get_nowait().getMessage() == "Message 1."
+
+    Logger.queue_size = 5
+    try:
+        Logger().get_logger()
+        assert Logger.logger.root.handlers[0].queue.maxsize == 5
+    finally:
+        Logger.queue_size = 10000
+        Logger().delete_run_info()
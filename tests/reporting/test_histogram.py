@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from apiautomationtools.reporting.histogram import BatchStats, LatencyHistogram
+
+pytestmark = pytest.mark.reporting
+
+
+def test_percentiles():
+    histogram = LatencyHistogram()
+    values = list(range(1, 100001))
+    random.shuffle(values)
+    for v in values:
+        histogram.record(v * 1000)
+
+    percentiles = histogram.percentiles([50, 90, 99, 99.9])
+    for p, expected in [(50, 50000), (90, 90000), (99, 99000), (99.9, 99900)]:
+        assert abs(percentiles[p] - expected * 1000) / (expected * 1000) < 0.01
+
+    assert histogram.min == 1000
+    assert histogram.max == 100000000
+    assert histogram.count == 100000
+
+
+def test_sub_millisecond_summary():
+    histogram = LatencyHistogram()
+    for v in [250000, 500000, 750000]:
+        histogram.record(v)
+
+    summary = histogram.summary()
+    assert summary["min"] == 0.00025
+    assert summary["max"] == 0.00075
+    assert abs(summary["p50"] - 0.0005) < 0.000005
+    assert summary["count"] == 3
+
+
+def test_empty_summary():
+    summary = LatencyHistogram().summary()
+    assert summary["count"] == 0
+    assert summary["p99"] is None
+
+
+def test_merge():
+    h1, h2, h3 = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for v in range(1, 1001):
+        (h1 if v % 2 else h2).record(v * 1000)
+        h3.record(v * 1000)
+
+    h1.merge(h2)
+    assert h1.counts == h3.counts
+    assert h1.summary() == h3.summary()
+
+
+def test_batch_stats():
+    stats = BatchStats()
+    records = [
+        {"description": "good", "expected_code": "200", "actual_code": "200"},
+        {"description": "good", "expected_code": "200", "actual_code": "500"},
+        {"description": "bad", "expected_code": "404", "actual_code": "404"},
+        {"description": "bad", "expected_code": "404", "actual_code": "200"},
+    ]
+    for r in records:
+        r["code_mismatch"] = "X" if r["actual_code"] != r["expected_code"] else ""
+        stats.record(r, 1000000)
+
+    summary = stats.summary(2)
+    assert summary["count"] == 4
+    assert summary["throughput"] == 2
+    assert summary["mismatch_rate"] == 0.5
+    assert summary["error_rate"] == 0.25
+    assert summary["latency"]["p50"] == 0.001
+
+    groups = {(g["description"], g["expected_code"]): g for g in summary["groups"]}
+    assert groups[("good", "200")]["error_rate"] == 0.5
+    assert groups[("bad", "404")]["mismatch_rate"] == 0.5
+
+
+def test_batch_stats_connections():
+    record = {"description": "a", "expected_code": 200, "actual_code": "200"}
+    stats, other = BatchStats(), BatchStats()
+    for connection in [1, 1, 1, 2]:
+        stats.record(record, 1000, connection)
+    other.record(record, 1000, 3)
+    stats.merge(other)
+
+    connections = stats.summary(1)["connections"]
+    assert connections["count"] == 3
+    assert connections["streams_per_connection"] == 5 / 3
+    assert connections["max_streams_per_connection"] == 3
+    assert "connections" not in BatchStats().summary(1)
+
+
+def test_batch_stats_warm():
+    record = {"description": "a", "expected_code": 200, "actual_code": "200"}
+    stats, other = BatchStats(), BatchStats()
+    for warm in [True, True, False]:
+        stats.record({**record, "warm": warm}, 1000)
+    other.record({**record, "warm": True}, 1000)
+    stats.merge(other)
+
+    assert stats.summary(1)["warm"] == {"count": 3, "rate": 0.75}
+    assert "warm" not in BatchStats().summary(1)